@@ -0,0 +1,127 @@
+from collections import OrderedDict
+import numpy as np
+from virtual_memory import ENGINES
+
+
+PAGE_SIZES = {
+    '4K': 4 << 10,
+    '2M': 2 << 20,
+    '1G': 1 << 30,
+}
+
+_CHUNK = 1 << 22
+
+
+def page_numbers(addresses, page_size=4096):
+    if page_size <= 0 or page_size & (page_size - 1):
+        raise ValueError("Page size must be a power of two")
+    shift = page_size.bit_length() - 1
+    return np.asarray(addresses, dtype=np.uint64) >> np.uint64(shift)
+
+
+def _page_runs(addresses, page_size, previous):
+    # Collapse consecutive references to the same page: the repeats are guaranteed TLB and
+    # frame hits under every policy here, so only the first reference of each run is simulated
+    vpn = page_numbers(addresses, page_size)
+    starts = np.empty(len(vpn), dtype=bool)
+    starts[0] = previous is None or vpn[0] != previous
+    starts[1:] = vpn[1:] != vpn[:-1]
+    return vpn[starts], int(len(vpn) - starts.sum()), vpn[-1]
+
+
+class _TLB:
+    # Set-associative TLB with LRU replacement inside each set
+
+    def __init__(self, entries, ways):
+        if entries <= 0 or ways <= 0 or entries % ways:
+            raise ValueError("TLB entries must be a positive multiple of the associativity")
+        self.sets_count = entries // ways
+        self.ways = ways
+        self.sets = [[] for _ in range(self.sets_count)]
+
+    def lookup(self, vpn):
+        tags = self.sets[vpn % self.sets_count]
+        if vpn in tags:
+            tags.remove(vpn)
+            tags.append(vpn)
+            return True
+        if len(tags) >= self.ways:
+            tags.pop(0)
+        tags.append(vpn)
+        return False
+
+    def invalidate(self, vpn):
+        tags = self.sets[vpn % self.sets_count]
+        if vpn in tags:
+            tags.remove(vpn)
+
+
+def AddressTranslation(frames, addresses, algorithm="FIFO", page_size=4096, levels=4, va_bits=48,
+                       tlb_entries=64, tlb_ways=4, walk_cache_entries=16,
+                       tlb_ns=1.0, memory_ns=100.0, fault_ns=8e6):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if page_size <= 0 or page_size & (page_size - 1):
+        raise ValueError("Page size must be a power of two")
+    if not 2 <= levels <= 4:
+        raise ValueError("Page tables must have 2 to 4 levels")
+    shift = page_size.bit_length() - 1
+    if va_bits <= shift:
+        raise ValueError("Virtual address width must exceed the page offset")
+    # Bits of the virtual page number resolved by the last level; the walk cache holds
+    # the upper levels' result, so a hit there costs a single memory reference
+    leaf_bits = -(-(va_bits - shift) // levels)
+
+    tlb = _TLB(tlb_entries, tlb_ways)
+    walk_cache = OrderedDict()
+    engine = ENGINES[algorithm](frames)
+    references = 0
+    tlb_hits = 0
+    walk_refs = 0
+    faults = 0
+    simulated = 0
+    previous = None
+
+    addresses = np.asarray(addresses)
+    for begin in range(0, len(addresses), _CHUNK):
+        vpns, repeats, previous = _page_runs(addresses[begin:begin + _CHUNK], page_size, previous)
+        references += len(vpns) + repeats
+        tlb_hits += repeats
+        simulated += len(vpns)
+        for vpn in vpns.tolist():
+            if tlb.lookup(vpn):
+                tlb_hits += 1
+            else:
+                upper = vpn >> leaf_bits
+                if upper in walk_cache:
+                    walk_cache.move_to_end(upper)
+                    walk_refs += 1
+                else:
+                    walk_refs += levels
+                    if walk_cache_entries:
+                        walk_cache[upper] = True
+                        if len(walk_cache) > walk_cache_entries:
+                            walk_cache.popitem(last=False)
+            if not engine.access(vpn):
+                faults += 1
+                if engine.evicted is not None:
+                    # TLB shootdown for the page that lost its frame
+                    tlb.invalidate(engine.evicted)
+
+    if references == 0:
+        raise ValueError("Address trace cannot be empty")
+    tlb_misses = references - tlb_hits
+    total_ns = references * (tlb_ns + memory_ns) + walk_refs * memory_ns + faults * fault_ns
+    return {
+        'references': references,
+        'simulated_steps': simulated,
+        'tlb_hits': tlb_hits,
+        'tlb_misses': tlb_misses,
+        'tlb_hit_rate': tlb_hits / references,
+        'walk_memory_references': walk_refs,
+        'faults': faults,
+        'hits': references - faults,
+        'effective_access_time_ns': total_ns / references,
+        'page_size': page_size,
+        'levels': levels,
+    }
@@ -0,0 +1,117 @@
+import math
+import numpy as np
+from virtual_memory import ENGINES, compact_references
+
+
+_PREFIX_RUNS = 1 << 16  # shorter traces are searched directly
+
+
+def _trial(algorithm, frames, pages, counts, writes, budget):
+    # Run until the fault budget is exceeded; a passing trial necessarily runs to the end
+    engine = ENGINES[algorithm](frames)
+    faults = 0
+    for run, (page, write) in enumerate(zip(pages, writes)):
+        if not engine.access(page, write):
+            faults += 1
+            if faults > budget:
+                return {'frames': frames, 'faults': faults, 'passed': False,
+                        'references': int(counts[:run + 1].sum())}
+    return {'frames': frames, 'faults': faults, 'passed': True, 'references': int(counts.sum())}
+
+
+def _search(algorithm, pages, counts, writes, max_fault_rate):
+    references = int(counts.sum())
+    # The tolerance keeps a rate like 0.29 of 100 references at 29 faults rather than 28.999...
+    budget = math.floor(max_fault_rate * references + 1e-9)
+    distinct = len(np.unique(pages))
+    # Every page faults once however many frames there are, and with one frame per page that
+    # is all that faults, so that trial is known without simulating it
+    trials = {distinct: {'frames': distinct, 'faults': distinct, 'passed': distinct <= budget, 'references': 0}}
+
+    def passes(frames):
+        if frames not in trials:
+            trials[frames] = _trial(algorithm, frames, pages, counts, writes, budget)
+        return trials[frames]['passed']
+
+    if not passes(distinct):
+        return None, passes, trials, budget, distinct, 0
+
+    # Trials near the answer run almost the whole trace, so the bracket is seeded from the
+    # same search on a prefix, and widened from there until it holds the answer
+    low, high = 0, 1
+    guess = None
+    prefix_references = 0
+    if len(pages) > _PREFIX_RUNS:
+        cut = len(pages) // 16
+        guess, _, prefix_trials, _, _, spent = _search(algorithm, pages[:cut], counts[:cut], writes[:cut],
+                                                       max_fault_rate)
+        prefix_references = spent + sum(trial['references'] for trial in prefix_trials.values())
+    if guess is None:
+        while not passes(high):
+            low, high = high, min(2 * high, distinct)
+    else:
+        guess = min(guess, distinct)
+        step = max(1, guess // 32)
+        if passes(guess):
+            high = guess
+            low = max(0, guess - step)
+            while low and passes(low):
+                high, step = low, 2 * step
+                low = max(0, high - step)
+        else:
+            low = guess
+            high = min(distinct, guess + step)
+            while not passes(high):
+                low, step = high, 2 * step
+                high = min(distinct, low + step)
+    while high - low > 1:
+        mid = (low + high) // 2
+        if passes(mid):
+            high = mid
+        else:
+            low = mid
+    return high, passes, trials, budget, distinct, prefix_references
+
+
+def TuneFrames(ref_string, max_fault_rate, algorithm="FIFO", writes=None, neighbourhood=3):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if not 0 <= max_fault_rate <= 1:
+        raise ValueError("Fault rate target must be between 0 and 1")
+    if neighbourhood < 0:
+        raise ValueError("Neighbourhood must be non-negative")
+    pages, counts, run_writes = compact_references(ref_string, writes)
+    references = int(counts.sum())
+    if references == 0:
+        raise ValueError("Reference string cannot be empty")
+    flags = run_writes.tolist() if run_writes is not None else [False] * len(pages)
+    answer, passes, trials, budget, distinct, prefix_references = _search(algorithm, pages.tolist(), counts, flags,
+                                                                          max_fault_rate)
+
+    # None of the engines is a stack algorithm (FIFO shows Belady's anomaly and the Second
+    # Chance variants degrade to FIFO), so the bisection may have stepped over a smaller
+    # passing count or landed next to a failing larger one: check around the answer
+    anomalies = []
+    if answer is not None and neighbourhood:
+        below = answer - 1
+        while below >= max(1, answer - neighbourhood):
+            if passes(below):
+                answer = below
+            below -= 1
+        anomalies = [f for f in range(answer + 1, min(answer + neighbourhood, distinct) + 1) if not passes(f)]
+
+    history = sorted(trials.values(), key=lambda trial: trial['frames'])
+    return {
+        'frames': answer,
+        'feasible': answer is not None,
+        'faults': None if answer is None else trials[answer]['faults'],
+        'fault_rate': None if answer is None else trials[answer]['faults'] / references,
+        'budget': budget,
+        'max_fault_rate': max_fault_rate,
+        'references': references,
+        'distinct_pages': distinct,
+        'anomalies': anomalies,
+        'trials': history,
+        'simulated_references': prefix_references + sum(trial['references'] for trial in history),
+        'algorithm': algorithm,
+    }
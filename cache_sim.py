@@ -0,0 +1,83 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from virtual_memory import ENGINES, RunAccessTypes, compact_references
+
+
+def split_addresses(addresses, sets, line_size=64):
+    # address -> (set, tag): the line number's low part picks the set, the rest is the tag
+    if line_size <= 0 or line_size & (line_size - 1):
+        raise ValueError("Line size must be a power of two")
+    if sets <= 0:
+        raise ValueError("Number of sets must be positive")
+    lines = np.asarray(addresses, dtype=np.int64) >> (line_size.bit_length() - 1)
+    return lines % sets, lines // sets
+
+
+def _run_sets(args):
+    # One engine per set; each set's tags are run-length compacted first
+    algorithm, ways, streams = args
+    outcomes = []
+    for tags, writes in streams:
+        engine = ENGINES[algorithm](ways)
+        runs, counts, run_writes = compact_references(tags, writes)
+        flags = run_writes.tolist() if run_writes is not None else [False] * len(runs)
+        run_hits = np.fromiter((engine.access(tag, write) for tag, write in zip(runs.tolist(), flags)),
+                               dtype=bool, count=len(runs))
+        outcomes.append(RunAccessTypes(counts, run_hits).to_array())
+    return outcomes
+
+
+def SetAssociative(addresses, sets=64, ways=8, line_size=64, algorithm="FIFO", writes=None, workers=None):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if ways <= 0:
+        raise ValueError("Associativity must be positive")
+    addresses = np.asarray(addresses, dtype=np.int64)
+    if addresses.ndim != 1 or len(addresses) == 0:
+        raise ValueError("Address trace cannot be empty")
+    if (addresses < 0).any():
+        raise ValueError("Addresses must be non-negative")
+    if writes is not None:
+        writes = np.asarray(writes, dtype=bool)
+        if writes.shape != addresses.shape:
+            raise ValueError("Write flags must match the address trace")
+    set_index, tags = split_addresses(addresses, sets, line_size)
+
+    # Sets never interact, so the trace is partitioned by set and the sets are dealt out
+    # to workers in contiguous groups
+    order = np.argsort(set_index, kind='stable')
+    bounds = np.searchsorted(set_index[order], np.arange(sets + 1))
+    used = [s for s in range(sets) if bounds[s + 1] > bounds[s]]
+    streams = [(tags[order[bounds[s]:bounds[s + 1]]],
+                None if writes is None else writes[order[bounds[s]:bounds[s + 1]]]) for s in used]
+    workers = min(len(used), os.cpu_count() or 1) if workers is None else workers
+    groups = np.array_split(np.arange(len(used)), max(1, workers))
+    tasks = [(algorithm, ways, [streams[i] for i in group.tolist()]) for group in groups if len(group)]
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = [hits for batch in pool.map(_run_sets, tasks) for hits in batch]
+    else:
+        outcomes = [hits for task in tasks for hits in _run_sets(task)]
+    hits = np.empty(len(addresses), dtype=bool)
+    hits[order] = np.concatenate(outcomes)
+
+    set_references = np.bincount(set_index, minlength=sets)
+    set_hits = np.bincount(set_index, weights=hits, minlength=sets).astype(np.int64)
+    set_hit_rate = np.where(set_references > 0, set_hits / np.maximum(set_references, 1), np.nan)
+    total_hits = int(hits.sum())
+    return {
+        'references': len(addresses),
+        'faults': len(addresses) - total_hits,
+        'hits': total_hits,
+        'hit_rate': total_hits / len(addresses),
+        'access_type': hits,
+        'set_index': set_index,
+        'set_references': set_references,
+        'set_hits': set_hits,
+        'set_hit_rate': set_hit_rate,
+        'sets': sets,
+        'ways': ways,
+        'line_size': line_size,
+        'algorithm': algorithm,
+    }
@@ -0,0 +1,146 @@
+import math
+import numpy as np
+
+
+# Reference geometries; seek_accel is in cylinders/ms^2 and max_velocity in cylinders/ms
+DRIVE_PROFILES = {
+    'laptop_5400': {
+        'cylinders': 120000,
+        'rpm': 5400,
+        'sectors_per_track': 900,
+        'settle_ms': 1.0,
+        'seek_accel': 1500.0,
+        'max_velocity': 6000.0,
+        'overhead_ms': 0.2,
+        'transfer_sectors': 8,
+    },
+    'desktop_7200': {
+        'cylinders': 100000,
+        'rpm': 7200,
+        'sectors_per_track': 1000,
+        'settle_ms': 0.75,
+        'seek_accel': 2500.0,
+        'max_velocity': 8500.0,
+        'overhead_ms': 0.1,
+        'transfer_sectors': 8,
+    },
+    'enterprise_15k': {
+        'cylinders': 75000,
+        'rpm': 15000,
+        'sectors_per_track': 800,
+        'settle_ms': 0.4,
+        'seek_accel': 4000.0,
+        'max_velocity': 12000.0,
+        'overhead_ms': 0.05,
+        'transfer_sectors': 8,
+    },
+}
+
+
+class DiskModel:
+
+    def __init__(self, cylinders, rpm=7200, sectors_per_track=1000, settle_ms=0.75,
+                 seek_accel=2500.0, max_velocity=8500.0, overhead_ms=0.1, transfer_sectors=8):
+        if cylinders <= 0 or rpm <= 0 or sectors_per_track <= 0:
+            raise ValueError("Cylinders, RPM and sectors per track must be positive")
+        if seek_accel <= 0 or max_velocity <= 0:
+            raise ValueError("Seek acceleration and velocity must be positive")
+        self.cylinders = cylinders
+        self.rpm = rpm
+        self.sectors_per_track = sectors_per_track
+        self.settle_ms = settle_ms
+        self.seek_accel = seek_accel
+        self.max_velocity = max_velocity
+        self.overhead_ms = overhead_ms
+        self.transfer_sectors = transfer_sectors
+
+    @classmethod
+    def from_profile(cls, name, cylinders=None):
+        if name not in DRIVE_PROFILES:
+            raise ValueError(f"Unknown drive profile: {name}")
+        params = dict(DRIVE_PROFILES[name])
+        if cylinders is not None:
+            # Keep seek time a function of the fraction of the stroke travelled
+            scale = cylinders / params['cylinders']
+            params['seek_accel'] *= scale
+            params['max_velocity'] *= scale
+            params['cylinders'] = cylinders
+        return cls(**params)
+
+    @property
+    def rotation_ms(self):
+        return 60000.0 / self.rpm
+
+    def seek_time(self, distances):
+        # Bang-bang seek: accelerate, coast at max_velocity if reached, decelerate, then settle
+        d = np.abs(np.asarray(distances, dtype=np.float64))
+        coast_threshold = self.max_velocity ** 2 / self.seek_accel
+        short = 2 * np.sqrt(d / self.seek_accel)
+        long = self.max_velocity / self.seek_accel + d / self.max_velocity
+        t = np.where(d <= coast_threshold, short, long) + self.settle_ms
+        return np.where(d > 0, t, 0.0)
+
+    def service_times(self, sequence, head_start, sectors=None, start_sector=0, serviced=None):
+        positions = np.asarray(sequence, dtype=np.int64)
+        rotation = self.rotation_ms
+        spt = self.sectors_per_track
+        seek = self.seek_time(np.diff(positions, prepend=head_start))
+        if serviced is not None:
+            # Stops that service nothing (a sweep's turnaround) are travel without a settle;
+            # their time is part of the next request's seek, and travel after the last
+            # request is not service time at all
+            serviced = np.asarray(serviced, dtype=bool)
+            seek = np.where(serviced, seek, np.maximum(seek - self.settle_ms, 0.0))
+            done = np.flatnonzero(serviced)
+            travelled = np.cumsum(seek)[done]
+            seek = np.diff(travelled, prepend=0.0)
+            positions = positions[done]
+        transfer = np.full(positions.shape, self.transfer_sectors / spt * rotation)
+
+        if sectors is None:
+            # Sector positions unknown: use the expected half-rotation latency
+            rotational = np.full(positions.shape, rotation / 2)
+        else:
+            # The platter angle after a transfer is fixed by where it ended, so every
+            # request's arrival angle follows from its predecessor without a time recurrence
+            sectors = np.asarray(sectors, dtype=np.float64)
+            ended = np.concatenate(([start_sector], sectors[:-1] + self.transfer_sectors))
+            arrival = (ended + (self.overhead_ms + seek) / rotation * spt) % spt
+            rotational = (sectors - arrival) % spt / spt * rotation
+
+        service = self.overhead_ms + seek + rotational + transfer
+        total = float(service.sum())
+        return {
+            'seek_times': seek,
+            'rotational_latencies': rotational,
+            'transfer_times': transfer,
+            'service_times': service,
+            'total_service_time': total,
+            'iops': len(positions) / (total / 1000) if total > 0 else 0.0,
+        }
+
+    def locate(self, lba):
+        cylinder, sector = divmod(int(lba), self.sectors_per_track)
+        if cylinder >= self.cylinders:
+            raise ValueError(f"Block {lba} is beyond the end of the disk")
+        return cylinder, sector
+
+    def seek_ms(self, distance):
+        # Scalar form of seek_time()
+        d = abs(distance)
+        if d == 0:
+            return 0.0
+        if d <= self.max_velocity ** 2 / self.seek_accel:
+            return 2 * math.sqrt(d / self.seek_accel) + self.settle_ms
+        return self.max_velocity / self.seek_accel + d / self.max_velocity + self.settle_ms
+
+    def request_time(self, from_cylinder, from_sector, cylinder, sector, length):
+        # Scalar form of service_times() for event-driven schedulers; returns the
+        # service time and the sector the head is over when the transfer ends
+        rotation = self.rotation_ms
+        spt = self.sectors_per_track
+        seek = self.seek_ms(cylinder - from_cylinder)
+        arrival = (from_sector + (self.overhead_ms + seek) / rotation * spt) % spt
+        rotational = (sector - arrival) % spt / spt * rotation
+        transfer = length / spt * rotation
+        return self.overhead_ms + seek + rotational + transfer, (sector + length) % spt
@@ -1,4 +1,24 @@
-def SCAN(request_queue, head_start, disk_size, direction="right"):
+import numpy as np
+
+
+def _with_timing(results, head_start, model):
+    if model is None:
+        return results
+    timing = model.service_times(results['head_path'], head_start, serviced=results['serviced'])
+    results['service_times'] = timing['service_times'].tolist()
+    results['total_service_time'] = timing['total_service_time']
+    results['iops'] = timing['iops']
+    return results
+
+
+def serviced_requests(results):
+    # Requests in service order, without SCAN's sweep to the end of the disk
+    if 'head_path' not in results:
+        return list(results['sequence'])
+    return [c for c, serviced in zip(results['head_path'], results['serviced']) if serviced]
+
+
+def SCAN(request_queue, head_start, disk_size, direction="right", model=None):
     request_queue.append(disk_size-1)
     page_frames = sorted(request_queue)
     left = [r for r in page_frames if r < head_start]
@@ -7,45 +27,64 @@ def SCAN(request_queue, head_start, disk_size, direction="right"):
     seek_sequence = []
     seek_distance = 0
     current = head_start
+    # Every cylinder the head stops at, and whether it services a request there: the turnaround
+    # at cylinder 0 and the appended end of the disk are head movement only
+    head_path = []
+    serviced = []
+    end_entry = len(right) - 1
 
     if direction == "right":
         # Move right
-        for r in right:
+        for i, r in enumerate(right):
             seek_sequence.append(r)
+            head_path.append(r)
+            serviced.append(i != end_entry)
             seek_distance += abs(current - r)
             current = r
         # Go to end of disk
         if current != disk_size - 1:
             seek_distance += abs(current - (disk_size - 1))
             current = disk_size - 1
+            head_path.append(current)
+            serviced.append(False)
         # Then reverse and move left
         for r in reversed(left):
             seek_sequence.append(r)
+            head_path.append(r)
+            serviced.append(True)
             seek_distance += abs(current - r)
             current = r
     else:
         # Move left
         for r in reversed(left):
             seek_sequence.append(r)
+            head_path.append(r)
+            serviced.append(True)
             seek_distance += abs(current - r)
             current = r
         # Go to start of disk
         if current != 0:
             seek_distance += abs(current - 0)
             current = 0
+            head_path.append(current)
+            serviced.append(False)
         # Then reverse and move right
-        for r in right:
+        for i, r in enumerate(right):
             seek_sequence.append(r)
+            head_path.append(r)
+            serviced.append(i != end_entry)
             seek_distance += abs(current - r)
             current = r
         
 
-    return {
+    return _with_timing({
         'sequence': seek_sequence,
         'seek_distance': seek_distance,
-    }
+        'head_path': head_path,
+        'serviced': serviced,
+    }, head_start, model)
 
-def LOOK(request_queue, head_start, direction="right"):
+def LOOK(request_queue, head_start, direction="right", model=None):
     page_frames = sorted(request_queue)
     left = [r for r in page_frames if r < head_start]
     right = [r for r in page_frames if r >= head_start]
@@ -73,7 +112,54 @@ def LOOK(request_queue, head_start, direction="right"):
             seek_distance += abs(current - r)
             current = r
 
-    return {
+    # LOOK reverses at the last request, so the head only ever stops to service one
+    return _with_timing({
         'sequence': seek_sequence,
         'seek_distance': seek_distance,
-    } 
\ No newline at end of file
+        'head_path': list(seek_sequence),
+        'serviced': [True] * len(seek_sequence),
+    }, head_start, model) 
+
+def SeekSweep(request_queue, disk_size):
+    # Seek distance of SCAN and LOOK for every head position 0..disk_size-1, both directions
+    heads = np.arange(disk_size, dtype=np.int64)
+    requests = np.asarray(request_queue, dtype=np.int64)
+    if requests.size == 0:
+        raise ValueError("Request queue cannot be empty")
+    if requests.min() < 0 or requests.max() >= disk_size:
+        raise ValueError("All queue values must be between 0 and number of cylinders")
+
+    # Bucket the queue by cylinder instead of sorting it, then take prefix minima / suffix maxima:
+    # lowest_below[h] = smallest request < h, highest_from[h] = largest request >= h
+    present = np.zeros(disk_size + 1, dtype=bool)
+    present[requests] = True
+    lowest_below = np.minimum.accumulate(np.where(present[:-1], heads, disk_size))
+    lowest_below = np.concatenate(([disk_size], lowest_below[:-1]))
+    highest_from = np.maximum.accumulate(np.where(present[:-1], heads, -1)[::-1])[::-1]
+    has_left = lowest_below < disk_size
+    has_right = highest_from >= 0
+
+    # LOOK reverses at the farthest request in the current direction
+    look_right = np.where(
+        has_right,
+        (highest_from - heads) + np.where(has_left, highest_from - lowest_below, 0),
+        heads - lowest_below,
+    )
+    look_left = np.where(
+        has_left,
+        (heads - lowest_below) + np.where(has_right, highest_from - lowest_below, 0),
+        highest_from - heads,
+    )
+
+    # SCAN always services the last cylinder, so it behaves like LOOK with that request added
+    end = disk_size - 1
+    scan_right = (end - heads) + np.where(has_left, end - lowest_below, 0)
+    scan_left = heads + end
+
+    return {
+        'heads': heads,
+        'scan_right': scan_right,
+        'scan_left': scan_left,
+        'look_right': look_right,
+        'look_left': look_left,
+    }
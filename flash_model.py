@@ -0,0 +1,237 @@
+import heapq
+import numpy as np
+from io_schedulers import load_trace
+
+
+# Latencies in microseconds; transfer_us moves one flash page over a channel
+FLASH_PROFILES = {
+    'sata_ssd': {
+        'channels': 4,
+        'dies_per_channel': 2,
+        'queue_depth': 32,
+        'read_us': 50.0,
+        'program_us': 500.0,
+        'erase_us': 3000.0,
+        'transfer_us': 20.0,
+    },
+    'nvme_tlc': {
+        'channels': 8,
+        'dies_per_channel': 4,
+        'queue_depth': 256,
+        'read_us': 60.0,
+        'program_us': 700.0,
+        'erase_us': 3500.0,
+        'transfer_us': 5.0,
+    },
+    'nvme_slc': {
+        'channels': 8,
+        'dies_per_channel': 2,
+        'queue_depth': 128,
+        'read_us': 25.0,
+        'program_us': 200.0,
+        'erase_us': 1500.0,
+        'transfer_us': 5.0,
+    },
+}
+
+
+class FlashModel:
+    # NAND device behind a page-mapped FTL: logical pages are striped over channel x die by
+    # page number, each die writes log-structured into its active block, and a die that runs
+    # low on free blocks garbage-collects the block with the fewest valid pages before writing
+
+    def __init__(self, logical_pages, channels=8, dies_per_channel=4, queue_depth=256, read_us=60.0,
+                 program_us=700.0, erase_us=3500.0, transfer_us=5.0, page_sectors=8, pages_per_block=64,
+                 overprovision=0.07, gc_threshold=2):
+        if logical_pages <= 0 or channels <= 0 or dies_per_channel <= 0 or queue_depth <= 0:
+            raise ValueError("Capacity, channels, dies and queue depth must be positive")
+        if not 0 < overprovision < 1:
+            raise ValueError("Over-provisioning must be between 0 and 1")
+        if gc_threshold < 1 or pages_per_block <= 0 or page_sectors <= 0:
+            raise ValueError("Block geometry and GC threshold must be positive")
+        self.logical_pages = logical_pages
+        self.channels = channels
+        self.dies_per_channel = dies_per_channel
+        self.dies = channels * dies_per_channel
+        self.queue_depth = queue_depth
+        self.read_ms = read_us / 1000
+        self.program_ms = program_us / 1000
+        self.erase_ms = erase_us / 1000
+        self.transfer_ms = transfer_us / 1000
+        self.page_sectors = page_sectors
+        self.pages_per_block = pages_per_block
+        self.overprovision = overprovision
+        self.gc_threshold = gc_threshold
+        # Spare blocks per die: the over-provisioned share, but never fewer than GC needs to
+        # always find a block with an invalid page
+        per_die = -(-logical_pages // self.dies)
+        data_blocks = -(-per_die // pages_per_block)
+        self.blocks_per_die = max(int(np.ceil(data_blocks / (1 - overprovision))), data_blocks + gc_threshold + 2)
+
+    @classmethod
+    def from_profile(cls, name, logical_pages, **overrides):
+        if name not in FLASH_PROFILES:
+            raise ValueError(f"Unknown flash profile: {name}")
+        params = dict(FLASH_PROFILES[name])
+        params.update(overrides)
+        return cls(logical_pages, **params)
+
+
+class _FTL:
+
+    def __init__(self, model):
+        self.model = model
+        ppb = model.pages_per_block
+        blocks = model.dies * model.blocks_per_die
+        self.l2p = np.full(model.logical_pages, -1, dtype=np.int64)
+        self.p2l = np.full(blocks * ppb, -1, dtype=np.int64)
+        self.valid = np.zeros(blocks, dtype=np.int64)
+        self.full = np.zeros(blocks, dtype=bool)
+        self.free = [list(range(d * model.blocks_per_die + 1, (d + 1) * model.blocks_per_die))[::-1]
+                     for d in range(model.dies)]
+        self.active = [d * model.blocks_per_die for d in range(model.dies)]
+        self.write_pointer = [0] * model.dies
+        self.nand_writes = 0
+        self.erases = 0
+        self.gc_moves = 0
+
+    def _append(self, die, lpn):
+        # Program lpn into the die's active block; returns the GC time spent opening a new block
+        ppb = self.model.pages_per_block
+        spent = 0.0
+        if self.write_pointer[die] == ppb:
+            self.full[self.active[die]] = True
+            self.active[die] = self.free[die].pop()
+            self.write_pointer[die] = 0
+            if len(self.free[die]) < self.model.gc_threshold:
+                spent = self._collect(die)
+        block = self.active[die]
+        page = block * ppb + self.write_pointer[die]
+        self.write_pointer[die] += 1
+        self.p2l[page] = lpn
+        self.l2p[lpn] = page
+        self.valid[block] += 1
+        self.nand_writes += 1
+        return spent
+
+    def _collect(self, die):
+        model = self.model
+        ppb = model.pages_per_block
+        first = die * model.blocks_per_die
+        spent = 0.0
+        while len(self.free[die]) < model.gc_threshold:
+            blocks = slice(first, first + model.blocks_per_die)
+            candidates = np.where(self.full[blocks], self.valid[blocks], ppb + 1)
+            victim = first + int(np.argmin(candidates))
+            if candidates[victim - first] >= ppb:
+                raise ValueError("Garbage collection found no reclaimable block")
+            pages = np.arange(victim * ppb, (victim + 1) * ppb)
+            moved = self.p2l[pages]
+            moved = moved[moved >= 0]
+            self.full[victim] = False
+            self.valid[victim] = 0
+            self.p2l[pages] = -1
+            self.free[die].insert(0, victim)
+            for lpn in moved.tolist():
+                # Copyback stays inside the die: no channel transfer
+                spent += model.read_ms + model.program_ms + self._append(die, lpn)
+                self.gc_moves += 1
+            spent += model.erase_ms
+            self.erases += 1
+        return spent
+
+    def write(self, lpn):
+        old = self.l2p[lpn]
+        if old >= 0:
+            self.p2l[old] = -1
+            self.valid[old // self.model.pages_per_block] -= 1
+        return self._append(lpn % self.model.dies, lpn)
+
+
+def Flash(trace, model=None, queue_depth=None, precondition=False):
+    data = load_trace(trace) if not isinstance(trace, dict) else trace
+    n = len(data['time'])
+    if n == 0:
+        raise ValueError("Trace cannot be empty")
+    if (data['lba'] < 0).any():
+        raise ValueError("Block addresses must be non-negative")
+    if model is None:
+        last = int(((data['lba'] + data['length'] - 1) // 8).max())
+        model = FlashModel.from_profile('nvme_tlc', last + 1)
+    queue_depth = model.queue_depth if queue_depth is None else queue_depth
+    if queue_depth <= 0:
+        raise ValueError("Queue depth must be positive")
+    first_pages = data['lba'] // model.page_sectors
+    last_pages = (data['lba'] + data['length'] - 1) // model.page_sectors
+    if last_pages.max() >= model.logical_pages:
+        raise ValueError("Trace addresses exceed the device's logical capacity")
+
+    ftl = _FTL(model)
+    if precondition:
+        # Fill the whole logical space once so the trace runs against a device in GC steady state
+        for lpn in range(model.logical_pages):
+            ftl.write(lpn)
+        ftl.nand_writes = ftl.erases = ftl.gc_moves = 0
+
+    die_free = [0.0] * model.dies
+    channel_free = [0.0] * model.channels
+    die_busy = 0.0
+    outstanding = []
+    latencies = np.empty(n)
+    host_writes = 0
+    times = data['time'].tolist()
+    finished = times[0]
+
+    for i, (arrival, first, last, is_write) in enumerate(zip(times, first_pages.tolist(), last_pages.tolist(),
+                                                            data['is_write'].tolist())):
+        # The host keeps at most queue_depth commands in flight, issued in arrival order
+        while outstanding and outstanding[0] <= arrival:
+            heapq.heappop(outstanding)
+        start = arrival
+        if len(outstanding) >= queue_depth:
+            start = max(arrival, heapq.heappop(outstanding))
+
+        done = start
+        for lpn in range(first, last + 1):
+            die = lpn % model.dies
+            channel = die % model.channels
+            if is_write:
+                # Data crosses the channel first, then the die programs it (after any GC it needs)
+                host_writes += 1
+                bus = max(start, channel_free[channel]) + model.transfer_ms
+                channel_free[channel] = bus
+                gc = ftl.write(lpn)
+                begin = max(bus, die_free[die])
+                die_free[die] = begin + gc + model.program_ms
+                die_busy += gc + model.program_ms
+                finish = die_free[die]
+            else:
+                begin = max(start, die_free[die])
+                die_free[die] = begin + model.read_ms
+                die_busy += model.read_ms
+                bus = max(die_free[die], channel_free[channel]) + model.transfer_ms
+                channel_free[channel] = bus
+                finish = bus
+            done = max(done, finish)
+        latencies[i] = done - arrival
+        finished = max(finished, done)
+        heapq.heappush(outstanding, done)
+
+    makespan = finished - times[0]
+    p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9])
+    return {
+        'requests': n,
+        'iops': n / (makespan / 1000) if makespan > 0 else 0.0,
+        'makespan': makespan,
+        'latencies': latencies,
+        'latency_p50': float(p50),
+        'latency_p99': float(p99),
+        'latency_p999': float(p999),
+        'host_pages_written': host_writes,
+        'nand_pages_written': ftl.nand_writes,
+        'write_amplification': ftl.nand_writes / host_writes if host_writes else 1.0,
+        'gc_page_moves': ftl.gc_moves,
+        'erases': ftl.erases,
+        'die_utilization': die_busy / (makespan * model.dies) if makespan > 0 else 0.0,
+        'queue_depth': queue_depth,
+    }
@@ -0,0 +1,251 @@
+import argparse
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from virtual_memory import FIFO, SecondChance, ENGINES
+from disk_scheduling import SCAN, LOOK, SeekSweep
+from disk_model import DiskModel
+from result_io import export_results, load_results
+
+
+# The list-based FIFO/SecondChance and SCAN/LOOK are the reference oracles: every fast path
+# is compared against them on generated cases, and a failing case is shrunk before reporting
+
+
+def _reference_string(rng, max_length):
+    # Mix of trace shapes so the generator reaches loops, scans and hot sets, not just noise
+    length = rng.randint(0, max_length)
+    pages = rng.choice((2, 3, 4, 6, 8, 16, 64))
+    shape = rng.random()
+    if shape < 0.4:
+        return [rng.randrange(pages) for _ in range(length)]
+    if shape < 0.6:
+        loop = rng.randint(1, pages)
+        return [i % loop for i in range(length)]
+    if shape < 0.8:
+        stride = rng.randint(1, 3)
+        start = rng.randrange(pages)
+        return [(start + i * stride) % pages for i in range(length)]
+    hot = max(1, pages // 4)
+    return [rng.randrange(hot) if rng.random() < 0.8 else rng.randrange(pages) for _ in range(length)]
+
+
+def _vm_case(rng, max_length):
+    return {'frames': rng.randint(1, 8), 'ref_string': _reference_string(rng, max_length)}
+
+
+def _disk_case(rng, max_length):
+    disk_size = rng.choice((2, 10, 50, 200, 1000))
+    queue = [rng.randrange(disk_size) for _ in range(rng.randint(1, max(1, max_length)))]
+    if rng.random() < 0.3:
+        queue += rng.sample(queue, min(len(queue), 3))  # Duplicate requests
+    return {'queue': queue, 'head': rng.randrange(disk_size), 'disk_size': disk_size,
+            'direction': rng.choice(("left", "right"))}
+
+
+def _run_engine(algorithm, frames, ref_string):
+    engine = ENGINES[algorithm](frames)
+    sequence = []
+    bits = []
+    access_type = []
+    for page in ref_string:
+        access_type.append(engine.access(page))
+        sequence.append(engine.page_frames.copy())
+        if hasattr(engine, 'reference_bits'):
+            bits.append(engine.reference_bits.copy())
+    results = {
+        'faults': access_type.count(False),
+        'hits': access_type.count(True),
+        'sequence': sequence,
+        'access_type': access_type,
+    }
+    if hasattr(engine, 'reference_bits'):
+        results['reference_bits'] = bits
+    return results
+
+
+def _compare_vm(case, expected, actual):
+    for key in ('faults', 'hits', 'access_type', 'sequence', 'reference_bits'):
+        if key not in expected:
+            continue
+        if key not in actual:
+            return f"{key} missing from the fast path"
+        if key in ('faults', 'hits'):
+            if expected[key] != actual[key]:
+                return f"{key}: expected {expected[key]}, got {actual[key]}"
+            continue
+        for step, (want, got) in enumerate(zip(expected[key], actual[key])):
+            if want != got:
+                return f"{key} at step {step}: expected {want}, got {got}"
+    # Properties that hold for any replacement policy
+    if actual['faults'] + actual['hits'] != len(case['ref_string']):
+        return "faults + hits does not match the number of references"
+    for step, frames in enumerate(actual['sequence']):
+        resident = [page for page in frames if page is not None]
+        if len(resident) != len(set(resident)) or case['ref_string'][step] not in resident:
+            return f"frame state at step {step} is not a valid resident set: {frames}"
+    return None
+
+
+def _check_fifo(case):
+    expected = FIFO(case['frames'], case['ref_string'])
+    return _compare_vm(case, expected, _run_engine('FIFO', case['frames'], case['ref_string']))
+
+
+def _check_second_chance(case):
+    expected = SecondChance(case['frames'], case['ref_string'])
+    return _compare_vm(case, expected, _run_engine('SecondChance', case['frames'], case['ref_string']))
+
+
+def _check_sweep(algorithm, case):
+    queue, head, disk_size, direction = case['queue'], case['head'], case['disk_size'], case['direction']
+    if algorithm == "SCAN":
+        expected = SCAN(list(queue), head, disk_size, direction)  # SCAN appends to its argument
+    else:
+        expected = LOOK(list(queue), head, direction)
+    got = int(SeekSweep(queue, disk_size)[f"{algorithm.lower()}_{direction}"][head])
+    if got != expected['seek_distance']:
+        return f"SeekSweep {algorithm} {direction}: expected {expected['seek_distance']}, got {got}"
+    # Properties: every request is serviced, and each sweep only moves one way
+    serviced = sorted(expected['sequence'])
+    wanted = sorted(queue + ([disk_size - 1] if algorithm == "SCAN" else []))
+    if serviced != wanted:
+        return f"{algorithm} serviced {serviced}, expected {wanted}"
+    path = [head] + expected['sequence']
+    turns = sum(1 for a, b, c in zip(path, path[1:], path[2:]) if (b - a) * (c - b) < 0)
+    if turns > 1:
+        return f"{algorithm} changed direction {turns} times"
+    return None
+
+
+def _check_export(case):
+    # SCAN's head path and service flags are one stop longer than its sequence and its service
+    # times one shorter, so each must round-trip as a column of its own length
+    queue, head, disk_size, direction = case['queue'], case['head'], case['disk_size'], case['direction']
+    expected = SCAN(list(queue), head, disk_size, direction, DiskModel(disk_size))
+    with tempfile.TemporaryDirectory() as folder:
+        for compress in (False, True):
+            path = os.path.join(folder, 'results.npz')
+            export_results(path, expected, meta={'cylinders': disk_size, 'head_start': head}, compress=compress)
+            loaded = load_results(path)
+            for key, want in expected.items():
+                if key not in loaded:
+                    return f"{key} missing after the round trip"
+                got = loaded[key]
+                if isinstance(want, (list, np.ndarray)) and len(want) >= 16 and not isinstance(got, np.ndarray):
+                    return f"{key} came back from the metadata instead of a column"
+                if not np.array_equal(np.asarray(want), np.asarray(got)):
+                    return f"{key}: expected {want}, got {got}"
+            del loaded
+    return None
+
+
+# name -> (case generator, checker, {list field to shrink: shortest valid length})
+TARGETS = {
+    'FIFO': (_vm_case, _check_fifo, {'ref_string': 0}),
+    'SecondChance': (_vm_case, _check_second_chance, {'ref_string': 0}),
+    'SCAN': (_disk_case, lambda case: _check_sweep("SCAN", case), {'queue': 1}),
+    'LOOK': (_disk_case, lambda case: _check_sweep("LOOK", case), {'queue': 1}),
+    'export': (_disk_case, _check_export, {'queue': 1}),
+}
+
+
+def _failure(check, case):
+    try:
+        return check(case)
+    except Exception as e:
+        return f"{type(e).__name__}: {e}"
+
+
+def _fuzz_batch(task):
+    target, seed, cases, max_length = task
+    generate, check, _ = TARGETS[target]
+    rng = random.Random(seed)
+    for _ in range(cases):
+        case = generate(rng, max_length)
+        message = _failure(check, case)
+        if message is not None:
+            return case, message
+    return None
+
+
+def minimize(target, case):
+    # Delta debugging over each list field, then smaller frame counts and page numbers,
+    # keeping any change under which the case still fails
+    _, check, fields = TARGETS[target]
+    case = dict(case)
+    fails = lambda candidate: _failure(check, candidate) is not None
+    for field, shortest in fields.items():
+        chunk = max(1, len(case[field]) // 2)
+        while chunk >= 1:
+            i = 0
+            shrunk = False
+            while i < len(case[field]):
+                candidate = dict(case, **{field: case[field][:i] + case[field][i + chunk:]})
+                if len(candidate[field]) >= shortest and fails(candidate):
+                    case = candidate
+                    shrunk = True
+                else:
+                    i += chunk
+            if not shrunk:
+                chunk //= 2
+    if 'frames' in case:
+        while case['frames'] > 1 and fails(dict(case, frames=case['frames'] - 1)):
+            case['frames'] -= 1
+    if 'ref_string' in case:
+        # Renumber pages 0, 1, 2... in order of first use
+        order = {}
+        renamed = [order.setdefault(page, len(order)) for page in case['ref_string']]
+        if fails(dict(case, ref_string=renamed)):
+            case['ref_string'] = renamed
+    return case
+
+
+def Fuzz(target, cases=100000, seed=0, workers=None, batch=2000, max_length=48):
+    if target not in TARGETS:
+        raise ValueError(f"Unknown fuzz target: {target}")
+    if cases <= 0 or batch <= 0:
+        raise ValueError("Case and batch counts must be positive")
+    tasks = [(target, seed * 1000003 + i, min(batch, cases - i * batch), max_length)
+             for i in range(-(-cases // batch))]
+    workers = min(len(tasks), os.cpu_count() or 1) if workers is None else workers
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(_fuzz_batch, tasks))
+    else:
+        outcomes = [_fuzz_batch(task) for task in tasks]
+
+    failures = []
+    for outcome in outcomes:
+        if outcome is not None:
+            case, message = outcome
+            minimized = minimize(target, case)
+            failures.append({
+                'case': case,
+                'message': message,
+                'minimized': minimized,
+                'minimized_message': _failure(TARGETS[target][1], minimized),
+            })
+    return {
+        'target': target,
+        'cases': cases,
+        'failures': failures,
+        'passed': not failures,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Differential fuzzing of the fast paths against the reference oracles")
+    parser.add_argument("targets", nargs="*", default=list(TARGETS), help="targets to fuzz (default: all)")
+    parser.add_argument("--cases", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    for name in args.targets:
+        report = Fuzz(name, args.cases, args.seed, args.workers)
+        print(f"{name}: {'ok' if report['passed'] else 'FAILED'} ({report['cases']} cases)")
+        for failure in report['failures']:
+            print(f"  {failure['minimized_message']}")
+            print(f"  minimized case: {failure['minimized']}")
@@ -0,0 +1,278 @@
+import heapq
+import itertools
+import numpy as np
+
+
+READ = 0
+WRITE = 1
+
+
+def load_trace(trace):
+    # trace: iterable of (arrival_ms, lba, sectors, op) with op 'R' or 'W'
+    times, lbas, lengths, ops = [], [], [], []
+    for arrival, lba, sectors, op in trace:
+        if op not in ('R', 'W'):
+            raise ValueError(f"Request type must be 'R' or 'W', got {op!r}")
+        if sectors <= 0:
+            raise ValueError("Request length must be positive")
+        times.append(arrival)
+        lbas.append(lba)
+        lengths.append(sectors)
+        ops.append(op == 'W')
+    order = np.argsort(np.asarray(times, dtype=np.float64), kind='stable')
+    return {
+        'time': np.asarray(times, dtype=np.float64)[order],
+        'lba': np.asarray(lbas, dtype=np.int64)[order],
+        'length': np.asarray(lengths, dtype=np.int64)[order],
+        'is_write': np.asarray(ops, dtype=bool)[order],
+    }
+
+
+class _SectorIndex:
+    # Fenwick tree of pending-request counts over the trace's sorted start sectors
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+        self.total = 0
+        self.top = 1 << size.bit_length()
+
+    def add(self, key, delta):
+        self.total += delta
+        i = key + 1
+        while i <= self.size:
+            self.tree[i] += delta
+            i += i & -i
+
+    def prefix(self, key):
+        count = 0
+        i = key
+        while i > 0:
+            count += self.tree[i]
+            i -= i & -i
+        return count
+
+    def next_from(self, key):
+        # Smallest occupied key >= key, or None
+        target = self.prefix(key)
+        if target >= self.total:
+            return None
+        pos = 0
+        step = self.top
+        while step:
+            if pos + step <= self.size and self.tree[pos + step] <= target:
+                pos += step
+                target -= self.tree[pos]
+            step >>= 1
+        return pos
+
+
+class _Request:
+    __slots__ = ('start', 'end', 'key', 'is_write', 'deadline', 'seq', 'members', 'done')
+
+    def __init__(self, start, end, key, is_write, deadline, seq, member):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.is_write = is_write
+        self.deadline = deadline
+        self.seq = seq
+        self.members = [member]
+        self.done = False
+
+
+class _Queue:
+    # Pending requests of one direction: sector index, merge maps and deadline FIFO
+
+    def __init__(self, coords):
+        self.coords = coords
+        self.index = _SectorIndex(len(coords))
+        self.buckets = {}
+        self.by_start = {}
+        self.by_end = {}
+        self.fifo = []
+        self.pushes = itertools.count()
+
+    def __len__(self):
+        return self.index.total
+
+    def insert(self, req):
+        self.buckets.setdefault(req.key, []).append(req)
+        self.index.add(req.key, 1)
+        self.by_start[req.start] = req
+        self.by_end[req.end] = req
+        heapq.heappush(self.fifo, (req.deadline, next(self.pushes), req))
+
+    def remove(self, req):
+        bucket = self.buckets[req.key]
+        bucket.remove(req)
+        if not bucket:
+            del self.buckets[req.key]
+        self.index.add(req.key, -1)
+        if self.by_start.get(req.start) is req:
+            del self.by_start[req.start]
+        if self.by_end.get(req.end) is req:
+            del self.by_end[req.end]
+
+    def absorb(self, req, other):
+        # Coalesce two adjacent pending requests into req
+        self.remove(other)
+        other.done = True
+        req.members.extend(other.members)
+        if other.deadline < req.deadline:
+            req.deadline = other.deadline
+            heapq.heappush(self.fifo, (req.deadline, next(self.pushes), req))
+
+    def next_in_order(self, lba):
+        key = self.index.next_from(int(np.searchsorted(self.coords, lba)))
+        return None if key is None else self.buckets[key][0]
+
+    def oldest(self):
+        while self.fifo:
+            deadline, _, req = self.fifo[0]
+            if not req.done and deadline == req.deadline:
+                return req
+            heapq.heappop(self.fifo)
+        return None
+
+
+def _simulate(trace, model, pick, read_expire, write_expire, max_sectors):
+    trace = load_trace(trace) if not isinstance(trace, dict) else trace
+    times, lbas, lengths, is_write = trace['time'], trace['lba'], trace['length'], trace['is_write']
+    n = len(times)
+    if n == 0:
+        raise ValueError("Trace cannot be empty")
+    if (lbas < 0).any() or (lbas + lengths).max() > model.cylinders * model.sectors_per_track:
+        raise ValueError("Trace addresses must lie within the disk")
+
+    coords = np.unique(lbas)
+    keys = np.searchsorted(coords, lbas).tolist()
+    queues = (_Queue(coords), _Queue(coords))
+    times_l, lbas_l, lengths_l, writes_l = times.tolist(), lbas.tolist(), lengths.tolist(), is_write.tolist()
+
+    def admit(i):
+        start, end, write = lbas_l[i], lbas_l[i] + lengths_l[i], writes_l[i]
+        queue = queues[write]
+        cand = queue.by_end.get(start)
+        if cand is not None and end - cand.start <= max_sectors:
+            # Back merge, then coalesce with a request that now follows directly
+            del queue.by_end[cand.end]
+            cand.end = end
+            queue.by_end[end] = cand
+            cand.members.append(i)
+            nxt = queue.by_start.get(end)
+            if nxt is not None and nxt is not cand and nxt.end - cand.start <= max_sectors:
+                del queue.by_end[cand.end]
+                cand.end = nxt.end
+                queue.absorb(cand, nxt)
+                queue.by_end[cand.end] = cand
+            return True
+        cand = queue.by_start.get(end)
+        if cand is not None and cand.end - start <= max_sectors:
+            # Front merge moves the request to an earlier slot in sector order
+            queue.remove(cand)
+            cand.start = start
+            cand.key = keys[i]
+            cand.members.append(i)
+            prev = queue.by_end.get(start)
+            queue.insert(cand)
+            if prev is not None and prev is not cand and cand.end - prev.start <= max_sectors:
+                queue.remove(cand)
+                cand.start = prev.start
+                cand.key = prev.key
+                queue.absorb(cand, prev)
+                queue.insert(cand)
+            return True
+        expire = write_expire if write else read_expire
+        queue.insert(_Request(start, end, keys[i], write, times_l[i] + expire, i, i))
+        return False
+
+    latencies = np.full(n, np.nan)
+    seek_sequence = []
+    seek_distance = 0
+    head_cylinder, head_sector = 0, 0
+    now = 0.0
+    i = 0
+    state = {'last': None, 'batching': 0, 'starved': 0, 'position': [0, 0]}
+
+    while i < n or len(queues[READ]) or len(queues[WRITE]):
+        while i < n and times_l[i] <= now:
+            admit(i)
+            i += 1
+        if not len(queues[READ]) and not len(queues[WRITE]):
+            now = times_l[i]
+            continue
+
+        req = pick(queues, state, now)
+        queues[req.is_write].remove(req)
+        req.done = True
+        state['position'][req.is_write] = req.end
+        cylinder, sector = model.locate(req.start)
+        service, head_sector = model.request_time(head_cylinder, head_sector, cylinder, sector,
+                                                  req.end - req.start)
+        now += service
+        seek_sequence.append(cylinder)
+        seek_distance += abs(cylinder - head_cylinder)
+        head_cylinder = cylinder
+        for m in req.members:
+            latencies[m] = now - times_l[m]
+
+    dispatched = len(seek_sequence)
+    makespan = now - times_l[0]
+    p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9])
+    return {
+        'sequence': seek_sequence,
+        'seek_distance': seek_distance,
+        'requests': n,
+        'dispatched': dispatched,
+        'merged_ratio': (n - dispatched) / n,
+        'iops': n / (makespan / 1000) if makespan > 0 else 0.0,
+        'makespan': makespan,
+        'latencies': latencies,
+        'latency_p50': float(p50),
+        'latency_p99': float(p99),
+        'latency_p999': float(p999),
+    }
+
+
+def Noop(trace, model, max_sectors=256):
+    # Merging only: with zero expiry the deadline FIFOs are arrival order
+    def pick(queues, state, now):
+        heads = [r for r in (queues[READ].oldest(), queues[WRITE].oldest()) if r is not None]
+        return min(heads, key=lambda r: (r.deadline, r.seq))
+
+    return _simulate(trace, model, pick, 0.0, 0.0, max_sectors)
+
+
+def Deadline(trace, model, read_expire=500.0, write_expire=5000.0, fifo_batch=16,
+             writes_starved=2, max_sectors=256):
+    def pick(queues, state, now):
+        last = state['last']
+        # Keep streaming the current batch in ascending sector order
+        if last is not None and state['batching'] < fifo_batch:
+            req = queues[last].next_in_order(state['position'][last])
+            if req is not None:
+                state['batching'] += 1
+                return req
+
+        reads, writes = len(queues[READ]), len(queues[WRITE])
+        if reads and not (writes and state['starved'] >= writes_starved):
+            op = READ
+            if writes:
+                state['starved'] += 1
+        else:
+            op = WRITE
+            state['starved'] = 0
+
+        queue = queues[op]
+        oldest = queue.oldest()
+        req = None
+        if oldest.deadline > now:
+            req = queue.next_in_order(state['position'][op])
+        if req is None:
+            req = oldest
+        state['last'] = op
+        state['batching'] = 1
+        return req
+
+    return _simulate(trace, model, pick, read_expire, write_expire, max_sectors)
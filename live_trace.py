@@ -0,0 +1,261 @@
+import asyncio
+import os
+import stat
+import threading
+from collections import deque
+import numpy as np
+from virtual_memory import ENGINES
+
+
+SOURCE_KINDS = ('file', 'pipe', 'socket')
+
+_CHUNK = 1 << 16
+
+
+def parse_lines(lines, block=False, sectors_per_page=8):
+    # Page mode lines are "page" or "page w"; block mode lines are "lba sectors R|W" and
+    # reference every page the request spans. Lines that do not parse are counted and skipped.
+    pages = []
+    writes = []
+    malformed = 0
+    for line in lines:
+        parts = line.split()
+        if not parts:
+            continue
+        try:
+            if block:
+                lba, sectors, op = int(parts[0]), int(parts[1]), parts[2].upper()
+                if lba < 0 or sectors <= 0 or op not in (b'R', b'W'):
+                    raise ValueError
+                first, last = lba // sectors_per_page, (lba + sectors - 1) // sectors_per_page
+                pages.extend(range(first, last + 1))
+                writes.extend([op == b'W'] * (last - first + 1))
+            else:
+                page = int(parts[0])
+                if page < 0 or len(parts) > 2 or (len(parts) == 2 and parts[1] not in (b'r', b'R', b'w', b'W')):
+                    raise ValueError
+                pages.append(page)
+                writes.append(len(parts) == 2 and parts[1] in (b'w', b'W'))
+        except (ValueError, IndexError):
+            malformed += 1
+    return pages, writes, malformed
+
+
+class LiveTrace:
+    # Feeds a streaming engine from a live trace on a background asyncio loop. The reader
+    # hands parsed batches to the simulator through a bounded queue: when the simulator falls
+    # behind, the reader stops reading and the kernel buffer pushes back on the tracer.
+
+    def __init__(self, source, frames, algorithm="FIFO", kind="file", block=False, sectors_per_page=8,
+                 batch_size=4096, max_batches=8, window=1000, history=600, from_start=False,
+                 poll_interval=0.05):
+        if algorithm not in ENGINES:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        if kind not in SOURCE_KINDS:
+            raise ValueError("Trace source must be 'file', 'pipe' or 'socket'")
+        if frames <= 0:
+            raise ValueError("Number of frames must be positive")
+        if batch_size <= 0 or max_batches <= 0 or window <= 0:
+            raise ValueError("Batch size, queue length and window must be positive")
+        self.source = source
+        self.kind = kind
+        self.algorithm = algorithm
+        self.block = block
+        self.sectors_per_page = sectors_per_page
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.window = window
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+        self.engine = ENGINES[algorithm](frames)
+
+        self._lock = threading.Lock()
+        self._recent = np.zeros(window, dtype=bool)  # ring of the last window fault bits
+        self._recent_pos = 0
+        self._recent_filled = 0
+        self._recent_faults = 0
+        self._history = deque(maxlen=history)
+        self._queue = None
+        self._offset = 0
+        self.references = 0
+        self.faults = 0
+        self.malformed = 0
+        self.stalls = 0
+        self.error = None
+
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def start(self):
+        if self._thread is not None:
+            raise ValueError("Live trace is already running")
+        # Check the source here so a bad path is reported to the caller, and fix the tail
+        # offset now rather than whenever the loop gets to it
+        if self.kind == "file":
+            if not os.path.isfile(self.source):
+                raise ValueError(f"Trace file not found: {self.source}")
+            self._offset = 0 if self.from_start else os.path.getsize(self.source)
+        elif self.kind == "pipe":
+            if not os.path.exists(self.source) or not stat.S_ISFIFO(os.stat(self.source).st_mode):
+                raise ValueError(f"{self.source} is not a named pipe")
+        elif os.path.exists(self.source) and not stat.S_ISSOCK(os.stat(self.source).st_mode):
+            raise ValueError(f"{self.source} exists and is not a socket")
+        self._thread = threading.Thread(target=asyncio.run, args=(self._main(),), daemon=True)
+        self._thread.start()
+        self._started.wait()
+
+    def stop(self, timeout=5.0):
+        if self._thread is None:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError:
+                pass  # The loop finished on its own
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def snapshot(self):
+        with self._lock:
+            filled = self._recent_filled
+            return {
+                'references': self.references,
+                'faults': self.faults,
+                'hits': self.references - self.faults,
+                'fault_rate': self.faults / self.references if self.references else 0.0,
+                'window_fault_rate': self._recent_faults / filled if filled else 0.0,
+                'history': list(self._history),
+                'pending_batches': self._queue.qsize() if self._queue is not None else 0,
+                'stalls': self.stalls,
+                'malformed': self.malformed,
+                'resident': sum(page is not None for page in self.engine.page_frames),
+                'error': self.error,
+            }
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._started.set()
+        try:
+            await self.run()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            with self._lock:
+                self.error = f"{type(e).__name__}: {e}"
+
+    async def run(self):
+        self._queue = asyncio.Queue(self.max_batches)
+        ingest = asyncio.ensure_future(self._ingest(self._queue))
+        try:
+            while True:
+                get = asyncio.ensure_future(self._queue.get())
+                done, _ = await asyncio.wait((get, ingest), return_when=asyncio.FIRST_COMPLETED)
+                if get not in done:
+                    get.cancel()
+                    ingest.result()  # Surface the reader's error
+                    return
+                self._apply(*get.result())
+        finally:
+            ingest.cancel()
+
+    def _apply(self, pages, writes):
+        access = self.engine.access
+        faults = ~np.fromiter((access(page, write) for page, write in zip(pages, writes)),
+                              dtype=bool, count=len(pages))
+        window = self.window
+        with self._lock:
+            self.references += len(faults)
+            self.faults += int(faults.sum())
+            if len(faults) >= window:
+                self._recent[:] = faults[-window:]
+                self._recent_pos = 0
+                self._recent_filled = window
+                self._recent_faults = int(self._recent.sum())
+            else:
+                # Slots not filled yet are still False, so subtracting them is harmless
+                slots = (self._recent_pos + np.arange(len(faults))) % window
+                self._recent_faults -= int(self._recent[slots].sum())
+                self._recent[slots] = faults
+                self._recent_faults += int(faults.sum())
+                self._recent_pos = (self._recent_pos + len(faults)) % window
+                self._recent_filled = min(window, self._recent_filled + len(faults))
+            self._history.append((self.references, self._recent_faults / self._recent_filled))
+
+    async def _emit(self, queue, data, final=False):
+        # Parse the complete lines of data and queue them in bounded batches; returns the
+        # trailing partial line
+        end = len(data) if final else data.rfind(b'\n') + 1
+        if end == 0:
+            return data
+        pages, writes, malformed = parse_lines(data[:end].split(b'\n'), self.block, self.sectors_per_page)
+        with self._lock:
+            self.malformed += malformed
+        for begin in range(0, len(pages), self.batch_size):
+            if queue.full():
+                with self._lock:
+                    self.stalls += 1
+            await queue.put((pages[begin:begin + self.batch_size], writes[begin:begin + self.batch_size]))
+        return data[end:]
+
+    async def _drain(self, reader, queue):
+        tail = b''
+        while True:
+            chunk = await reader.read(_CHUNK)
+            if not chunk:
+                break
+            tail = await self._emit(queue, tail + chunk)
+        await self._emit(queue, tail, final=True)
+
+    async def _ingest(self, queue):
+        if self.kind == "file":
+            await self._tail_file(queue)
+        elif self.kind == "pipe":
+            await self._read_pipe(queue)
+        else:
+            await self._serve_socket(queue)
+
+    async def _tail_file(self, queue):
+        with open(self.source, 'rb') as f:
+            f.seek(self._offset)
+            tail = b''
+            while True:
+                chunk = f.read(_CHUNK)
+                if not chunk:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+                tail = await self._emit(queue, tail + chunk)
+
+    async def _read_pipe(self, queue):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Reopen after every writer disconnects so the tracer can be restarted
+            pipe = os.fdopen(os.open(self.source, os.O_RDONLY | os.O_NONBLOCK), 'rb', buffering=0)
+            reader = asyncio.StreamReader(limit=_CHUNK)
+            transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+            try:
+                await self._drain(reader, queue)
+            finally:
+                transport.close()
+            await asyncio.sleep(self.poll_interval)
+
+    async def _serve_socket(self, queue):
+        async def connected(reader, writer):
+            try:
+                await self._drain(reader, queue)
+            finally:
+                writer.close()
+
+        server = await asyncio.start_unix_server(connected, self.source)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if os.path.exists(self.source):
+                os.unlink(self.source)
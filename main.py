@@ -2,15 +2,29 @@ import sys
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QPushButton, QLabel, QScrollArea, 
                             QFrame, QLineEdit, QRadioButton, QButtonGroup,
-                            QTextEdit, QMessageBox, QStackedWidget)
-from PyQt6.QtCore import Qt, QSize
+                            QTextEdit, QMessageBox, QStackedWidget, QComboBox,
+                            QFileDialog)
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QFont, QIcon, QPalette, QColor, QPixmap, QPainter, QPen
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from qt_material import apply_stylesheet
 import numpy as np
-from virtual_memory import FIFO, SecondChance
-from disk_scheduling import SCAN, LOOK
+from virtual_memory import FIFO, SecondChance, EnhancedSecondChance, WorkingSet, WSClock, SHARDS
+from disk_scheduling import SCAN, LOOK, SeekSweep, serviced_requests
+from disk_model import DiskModel, DRIVE_PROFILES
+from prefetch import Prefetch, PREFETCHERS
+from autotune import TuneFrames
+from live_trace import LiveTrace
+from result_io import export_results, load_results, as_views, first_steps
+from playback import VMPlayback, DiskPlayback, SPEEDS
+from renderers import (new_figure, render_vm_grid, render_ws_series, render_vm_stats, render_vm_mrc,
+                       render_ds_path, render_ds_stats, render_ds_sweep)
+
+
+RESULT_FILE_FILTERS = "NumPy archive (*.npz);;Arrow IPC (*.arrow);;Parquet (*.parquet)"
+SHOWN_STEPS = 500  # steps listed in the results text; longer runs show their start
+GRID_STEPS = 100  # steps drawn cell by cell in the allocation grid
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -366,6 +380,21 @@ class MainWindow(QMainWindow):
         algo_group.addButton(self.second_chance_radio)
         algo_layout.addWidget(self.second_chance_radio)
         
+        self.enhanced_radio = QRadioButton("Enhanced Second Chance (suffix writes with w, e.g. 3w)")
+        self.enhanced_radio.setFont(QFont("Segoe UI", 11))
+        algo_group.addButton(self.enhanced_radio)
+        algo_layout.addWidget(self.enhanced_radio)
+        
+        self.working_set_radio = QRadioButton("Working Set (window τ)")
+        self.working_set_radio.setFont(QFont("Segoe UI", 11))
+        algo_group.addButton(self.working_set_radio)
+        algo_layout.addWidget(self.working_set_radio)
+        
+        self.wsclock_radio = QRadioButton("WSClock (window τ)")
+        self.wsclock_radio.setFont(QFont("Segoe UI", 11))
+        algo_group.addButton(self.wsclock_radio)
+        algo_layout.addWidget(self.wsclock_radio)
+        
         content_layout.addWidget(algo_frame)
         
        
@@ -417,6 +446,109 @@ class MainWindow(QMainWindow):
         ref_layout.addWidget(self.ref_input)
         input_layout.addLayout(ref_layout)
         
+        
+        rate_layout = QHBoxLayout()
+        rate_label = QLabel("MRC Sampling Rate (0-1]:")
+        rate_label.setFont(QFont("Segoe UI", 11))
+        self.sample_rate_input = QLineEdit("1.0")
+        self.sample_rate_input.setStyleSheet("""
+            QLineEdit {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        rate_layout.addWidget(rate_label)
+        rate_layout.addWidget(self.sample_rate_input)
+        input_layout.addLayout(rate_layout)
+        
+        
+        target_layout = QHBoxLayout()
+        target_label = QLabel("Target Fault Rate (%):")
+        target_label.setFont(QFont("Segoe UI", 11))
+        self.target_rate_input = QLineEdit("10")
+        self.target_rate_input.setStyleSheet("""
+            QLineEdit {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        target_layout.addWidget(target_label)
+        target_layout.addWidget(self.target_rate_input)
+        input_layout.addLayout(target_layout)
+        
+        
+        tau_layout = QHBoxLayout()
+        tau_label = QLabel("Working Set Window τ:")
+        tau_label.setFont(QFont("Segoe UI", 11))
+        self.tau_input = QLineEdit("4")
+        self.tau_input.setStyleSheet("""
+            QLineEdit {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        tau_layout.addWidget(tau_label)
+        tau_layout.addWidget(self.tau_input)
+        input_layout.addLayout(tau_layout)
+        
+        
+        prefetch_layout = QHBoxLayout()
+        prefetch_label = QLabel("Prefetcher:")
+        prefetch_label.setFont(QFont("Segoe UI", 11))
+        self.prefetcher_input = QComboBox()
+        self.prefetcher_input.addItem("None (demand paging)")
+        self.prefetcher_input.addItems(PREFETCHERS.keys())
+        self.prefetcher_input.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        prefetch_layout.addWidget(prefetch_label)
+        prefetch_layout.addWidget(self.prefetcher_input)
+        input_layout.addLayout(prefetch_layout)
+        
+        
+        live_layout = QHBoxLayout()
+        live_label = QLabel("Live Trace Source:")
+        live_label.setFont(QFont("Segoe UI", 11))
+        self.live_source_input = QLineEdit()
+        self.live_source_input.setPlaceholderText("path to a trace file, named pipe or Unix socket")
+        self.live_source_input.setStyleSheet("""
+            QLineEdit {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        self.live_kind_input = QComboBox()
+        self.live_kind_input.addItems(["Tailed file", "Named pipe", "Unix socket"])
+        self.live_format_input = QComboBox()
+        self.live_format_input.addItems(["Page references", "Block requests (lba sectors R|W)"])
+        for combo in (self.live_kind_input, self.live_format_input):
+            combo.setStyleSheet("""
+                QComboBox {
+                    padding: 8px;
+                    border: 1px solid #ddd;
+                    border-radius: 5px;
+                    background-color: white;
+                }
+            """)
+        live_layout.addWidget(live_label)
+        live_layout.addWidget(self.live_source_input)
+        live_layout.addWidget(self.live_kind_input)
+        live_layout.addWidget(self.live_format_input)
+        input_layout.addLayout(live_layout)
+        
         content_layout.addWidget(input_frame)
         
        
@@ -436,6 +568,87 @@ class MainWindow(QMainWindow):
         """)
         self.vm_run_button.clicked.connect(self.run_vm_simulation)
         
+        self.vm_mrc_button = QPushButton("Miss-Ratio Curve")
+        self.vm_mrc_button.setFont(QFont("Segoe UI", 11))
+        self.vm_mrc_button.setStyleSheet("""
+            QPushButton {
+                background-color: #00897B;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #00695C;
+            }
+        """)
+        self.vm_mrc_button.clicked.connect(self.run_vm_mrc)
+
+        self.vm_tune_button = QPushButton("Tune Frames")
+        self.vm_tune_button.setFont(QFont("Segoe UI", 11))
+        self.vm_tune_button.setStyleSheet("""
+            QPushButton {
+                background-color: #F57C00;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #E65100;
+            }
+        """)
+        self.vm_tune_button.clicked.connect(self.run_vm_tune)
+
+        self.vm_live_button = QPushButton("Attach Live Trace")
+        self.vm_live_button.setFont(QFont("Segoe UI", 11))
+        self.vm_live_button.setStyleSheet("""
+            QPushButton {
+                background-color: #6A1B9A;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #4A148C;
+            }
+        """)
+        self.vm_live_button.clicked.connect(self.toggle_live_trace)
+        
+        self.live_trace = None
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(250)
+        self.live_timer.timeout.connect(self.update_live_view)
+        
+        self.vm_export_button = QPushButton("Export")
+        self.vm_export_button.setFont(QFont("Segoe UI", 11))
+        self.vm_export_button.setStyleSheet("""
+            QPushButton {
+                background-color: #546E7A;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+        """)
+        self.vm_export_button.clicked.connect(self.export_vm_results)
+        
+        self.vm_import_button = QPushButton("Import")
+        self.vm_import_button.setFont(QFont("Segoe UI", 11))
+        self.vm_import_button.setStyleSheet("""
+            QPushButton {
+                background-color: #546E7A;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+        """)
+        self.vm_import_button.clicked.connect(self.import_vm_results)
+        self.vm_last_run = None
+        
         self.vm_reset_button = QPushButton("Reset")
         self.vm_reset_button.setFont(QFont("Segoe UI", 11))
         self.vm_reset_button.setStyleSheet("""
@@ -452,9 +665,64 @@ class MainWindow(QMainWindow):
         self.vm_reset_button.clicked.connect(self.reset_vm)
         
         buttons_layout.addWidget(self.vm_run_button)
+        buttons_layout.addWidget(self.vm_mrc_button)
+        buttons_layout.addWidget(self.vm_tune_button)
+        buttons_layout.addWidget(self.vm_live_button)
+        buttons_layout.addWidget(self.vm_export_button)
+        buttons_layout.addWidget(self.vm_import_button)
         buttons_layout.addWidget(self.vm_reset_button)
         content_layout.addLayout(buttons_layout)
         
+        playback_layout = QHBoxLayout()
+        self.vm_play_button = QPushButton("Play")
+        self.vm_play_button.setFont(QFont("Segoe UI", 11))
+        self.vm_play_button.setStyleSheet("""
+            QPushButton {
+                background-color: #43A047;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #388E3C;
+            }
+        """)
+        self.vm_play_button.clicked.connect(self.toggle_vm_playback)
+        
+        self.vm_step_button = QPushButton("Step")
+        self.vm_step_button.setFont(QFont("Segoe UI", 11))
+        self.vm_step_button.setStyleSheet("""
+            QPushButton {
+                background-color: #43A047;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #388E3C;
+            }
+        """)
+        self.vm_step_button.clicked.connect(self.step_vm_playback)
+        
+        self.vm_speed_input = QComboBox()
+        self.vm_speed_input.addItems(SPEEDS.keys())
+        self.vm_speed_input.setCurrentText('5 steps/s')
+        self.vm_speed_input.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        self.vm_speed_input.currentTextChanged.connect(self.set_vm_playback_speed)
+        self.vm_playback = None
+        
+        playback_layout.addWidget(self.vm_play_button)
+        playback_layout.addWidget(self.vm_step_button)
+        playback_layout.addWidget(self.vm_speed_input)
+        content_layout.addLayout(playback_layout)
+        
       
         results_frame = QFrame()
         results_frame.setStyleSheet("""
@@ -661,6 +929,25 @@ class MainWindow(QMainWindow):
         queue_layout.addWidget(self.queue_input)
         input_layout.addLayout(queue_layout)
         
+        
+        profile_layout = QHBoxLayout()
+        profile_label = QLabel("Drive Profile:")
+        profile_label.setFont(QFont("Segoe UI", 11))
+        self.drive_profile_input = QComboBox()
+        self.drive_profile_input.addItem("None (seek distance only)")
+        self.drive_profile_input.addItems(DRIVE_PROFILES.keys())
+        self.drive_profile_input.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        profile_layout.addWidget(profile_label)
+        profile_layout.addWidget(self.drive_profile_input)
+        input_layout.addLayout(profile_layout)
+        
         content_layout.addWidget(input_frame)
         
         
@@ -680,6 +967,52 @@ class MainWindow(QMainWindow):
         """)
         self.ds_run_button.clicked.connect(self.run_ds_simulation)
         
+        self.ds_sweep_button = QPushButton("Seek Sweep")
+        self.ds_sweep_button.setFont(QFont("Segoe UI", 11))
+        self.ds_sweep_button.setStyleSheet("""
+            QPushButton {
+                background-color: #00897B;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #00695C;
+            }
+        """)
+        self.ds_sweep_button.clicked.connect(self.run_ds_sweep)
+        
+        self.ds_export_button = QPushButton("Export")
+        self.ds_export_button.setFont(QFont("Segoe UI", 11))
+        self.ds_export_button.setStyleSheet("""
+            QPushButton {
+                background-color: #546E7A;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+        """)
+        self.ds_export_button.clicked.connect(self.export_ds_results)
+        
+        self.ds_import_button = QPushButton("Import")
+        self.ds_import_button.setFont(QFont("Segoe UI", 11))
+        self.ds_import_button.setStyleSheet("""
+            QPushButton {
+                background-color: #546E7A;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #455A64;
+            }
+        """)
+        self.ds_import_button.clicked.connect(self.import_ds_results)
+        self.ds_last_run = None
+        
         self.ds_reset_button = QPushButton("Reset")
         self.ds_reset_button.setFont(QFont("Segoe UI", 11))
         self.ds_reset_button.setStyleSheet("""
@@ -696,9 +1029,62 @@ class MainWindow(QMainWindow):
         self.ds_reset_button.clicked.connect(self.reset_ds)
         
         buttons_layout.addWidget(self.ds_run_button)
+        buttons_layout.addWidget(self.ds_sweep_button)
+        buttons_layout.addWidget(self.ds_export_button)
+        buttons_layout.addWidget(self.ds_import_button)
         buttons_layout.addWidget(self.ds_reset_button)
         content_layout.addLayout(buttons_layout)
         
+        playback_layout = QHBoxLayout()
+        self.ds_play_button = QPushButton("Play")
+        self.ds_play_button.setFont(QFont("Segoe UI", 11))
+        self.ds_play_button.setStyleSheet("""
+            QPushButton {
+                background-color: #43A047;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #388E3C;
+            }
+        """)
+        self.ds_play_button.clicked.connect(self.toggle_ds_playback)
+        
+        self.ds_step_button = QPushButton("Step")
+        self.ds_step_button.setFont(QFont("Segoe UI", 11))
+        self.ds_step_button.setStyleSheet("""
+            QPushButton {
+                background-color: #43A047;
+                color: white;
+                border-radius: 5px;
+                padding: 10px 20px;
+            }
+            QPushButton:hover {
+                background-color: #388E3C;
+            }
+        """)
+        self.ds_step_button.clicked.connect(self.step_ds_playback)
+        
+        self.ds_speed_input = QComboBox()
+        self.ds_speed_input.addItems(SPEEDS.keys())
+        self.ds_speed_input.setCurrentText('5 steps/s')
+        self.ds_speed_input.setStyleSheet("""
+            QComboBox {
+                padding: 8px;
+                border: 1px solid #ddd;
+                border-radius: 5px;
+                background-color: white;
+            }
+        """)
+        self.ds_speed_input.currentTextChanged.connect(self.set_ds_playback_speed)
+        self.ds_playback = None
+        
+        playback_layout.addWidget(self.ds_play_button)
+        playback_layout.addWidget(self.ds_step_button)
+        playback_layout.addWidget(self.ds_speed_input)
+        content_layout.addLayout(playback_layout)
+        
         
         results_frame = QFrame()
         results_frame.setStyleSheet("""
@@ -746,40 +1132,324 @@ class MainWindow(QMainWindow):
         
         return ds_page
 
+    def read_vm_inputs(self):
+        frames = int(self.frames_input.text())
+        if frames <= 0:
+            raise ValueError("Number of frames must be positive")
+        
+        ref_string, writes, algorithm = self.read_vm_reference()
+        return frames, ref_string, writes, algorithm
+
+    def read_vm_reference(self):
+        ref_string_text = self.ref_input.text().strip()
+        if not ref_string_text:
+            raise ValueError("Reference string cannot be empty")
+        if ref_string_text.startswith(',') or ref_string_text.endswith(','):
+            raise ValueError("Reference string should not start or end with a comma")
+        if ',,' in ref_string_text:
+            raise ValueError("Reference string should not contain consecutive commas")
+        
+        ref_string_parts = [part.strip() for part in ref_string_text.split(',')]
+        writes = [part[-1:] in ('w', 'W') for part in ref_string_parts]
+        ref_string_parts = [part[:-1] if write else part for part, write in zip(ref_string_parts, writes)]
+        for part in ref_string_parts:
+            if not part.strip().isdigit():
+                raise ValueError("Reference string must contain only numbers (writes may end in w)")
+        
+        ref_string = [int(x.strip()) for x in ref_string_parts]
+        if not all(x >= 0 for x in ref_string):
+            raise ValueError("Reference string values must be non-negative")
+        
+        if self.fifo_radio.isChecked():
+            algorithm = "FIFO"
+        elif self.second_chance_radio.isChecked():
+            algorithm = "SecondChance"
+        elif self.enhanced_radio.isChecked():
+            algorithm = "EnhancedSecondChance"
+        elif self.working_set_radio.isChecked():
+            algorithm = "WorkingSet"
+        else:
+            algorithm = "WSClock"
+        return ref_string, writes, algorithm
+
     def run_vm_simulation(self):
+        self.stop_vm_playback()
         try:
-            frames = int(self.frames_input.text())
-            if frames <= 0:
-                raise ValueError("Number of frames must be positive")
+            frames, ref_string, writes, algorithm = self.read_vm_inputs()
             
-            ref_string_text = self.ref_input.text().strip()
-            if not ref_string_text:
-                raise ValueError("Reference string cannot be empty")
-            if ref_string_text.startswith(',') or ref_string_text.endswith(','):
-                raise ValueError("Reference string should not start or end with a comma")
-            if ',,' in ref_string_text:
-                raise ValueError("Reference string should not contain consecutive commas")
+            if self.prefetcher_input.currentIndex() > 0:
+                if algorithm not in ("FIFO", "SecondChance", "EnhancedSecondChance"):
+                    raise ValueError("Prefetching is available for FIFO and the Second Chance variants")
+                results = Prefetch(frames, ref_string, self.prefetcher_input.currentText(), algorithm, record=True)
+            elif algorithm == "FIFO":
+                results = FIFO(frames, ref_string)
+            elif algorithm == "SecondChance":
+                results = SecondChance(frames, ref_string)
+            elif algorithm == "EnhancedSecondChance":
+                results = EnhancedSecondChance(frames, ref_string, writes)
+            else:
+                if not self.tau_input.text().strip().isdigit() or int(self.tau_input.text()) <= 0:
+                    raise ValueError("Working set window must be a positive number")
+                tau = int(self.tau_input.text())
+                if algorithm == "WorkingSet":
+                    results = WorkingSet(ref_string, tau)
+                else:
+                    results = WSClock(frames, ref_string, tau, writes)
             
-            ref_string_parts = ref_string_text.split(',')
-            for part in ref_string_parts:
-                if not part.strip().isdigit():
-                    raise ValueError("Reference string must contain only numbers")
+            self.display_vm_results(results)
+            self.visualize_vm_stats(results)
+            if 'ws_size' in results:
+                self.visualize_ws_series(results, frames)
+            self.vm_last_run = (results, frames)
             
-            ref_string = [int(x.strip()) for x in ref_string_parts]
-            if not all(x >= 0 for x in ref_string):
-                raise ValueError("Reference string values must be non-negative")
+        except ValueError as e:
+            QMessageBox.critical(self, "Input Error", str(e))
+
+    def run_vm_mrc(self):
+        self.stop_vm_playback()
+        try:
+            frames, ref_string, writes, algorithm = self.read_vm_inputs()
+            try:
+                sample_rate = float(self.sample_rate_input.text())
+            except ValueError:
+                raise ValueError("Sampling rate must be a number")
             
-            algorithm = "FIFO" if self.fifo_radio.isChecked() else "SecondChance"
+            results = SHARDS(frames, ref_string, sample_rate, algorithm)
+            self.display_vm_mrc(results)
             
-            if algorithm == "FIFO":
-                results = FIFO(frames, ref_string)
+        except ValueError as e:
+            QMessageBox.critical(self, "Input Error", str(e))
+
+    def run_vm_tune(self):
+        self.stop_vm_playback()
+        try:
+            ref_string, writes, algorithm = self.read_vm_reference()
+            if algorithm not in ("FIFO", "SecondChance", "EnhancedSecondChance"):
+                raise ValueError("Frame tuning is available for FIFO and the Second Chance variants")
+            try:
+                target = float(self.target_rate_input.text())
+            except ValueError:
+                raise ValueError("Target fault rate must be a number")
+            if not 0 <= target <= 100:
+                raise ValueError("Target fault rate must be between 0 and 100")
+            
+            results = TuneFrames(ref_string, target / 100, algorithm, writes)
+            self.display_vm_tune(results)
+            if results['feasible']:
+                self.frames_input.setText(str(results['frames']))
+            
+        except ValueError as e:
+            QMessageBox.critical(self, "Input Error", str(e))
+
+    def display_vm_tune(self, results):
+        self.vm_results_text.clear()
+        self.vm_results_text.append(f"Algorithm: {results['algorithm']}")
+        self.vm_results_text.append(f"Target Fault Rate: {results['max_fault_rate'] * 100:.1f}% "
+                                    f"({results['budget']} of {results['references']} references)")
+        if not results['feasible']:
+            self.vm_results_text.append(f"\nNo frame count meets the target: the {results['distinct_pages']} "
+                                        f"distinct pages alone fault {results['distinct_pages']} times")
+        else:
+            self.vm_results_text.append(f"\nSmallest Frame Count: {results['frames']}")
+            self.vm_results_text.append(f"Fault Rate: {results['fault_rate'] * 100:.1f}% ({results['faults']} faults)")
+            if results['anomalies']:
+                frames = ", ".join(str(f) for f in results['anomalies'])
+                self.vm_results_text.append(f"Belady's anomaly: {frames} frames miss the target again")
+        self.vm_results_text.append(f"\nTrials: {len(results['trials'])}, "
+                                    f"{results['simulated_references']} references simulated\n")
+        self.vm_results_text.append("Frames | Faults | Outcome")
+        for trial in results['trials']:
+            if trial['passed']:
+                outcome = "within target"
             else:
-                results = SecondChance(frames, ref_string)
+                outcome = f"over budget after {trial['references']} references"
+            self.vm_results_text.append(f"{trial['frames']:>6} | {trial['faults']:>6} | {outcome}")
+
+    def display_vm_mrc(self, results):
+        self.vm_results_text.clear()
+        self.vm_results_text.append(f"Algorithm: {results['algorithm']}")
+        self.vm_results_text.append(f"Sampling Rate: {results['sample_rate']}")
+        self.vm_results_text.append(f"Sampled References: {results['sampled_references']} of {results['total_references']}\n")
+        self.vm_results_text.append("Frames | Miss Ratio | Error Bound (sampling + cache scaling)")
+        for frames, ratio, bound, sampling, scaling in zip(results['frames'], results['miss_ratio'], results['error_bound'],
+                                                           results['sampling_error'], results['scaling_error']):
+            self.vm_results_text.append(f"{frames:>6} | {ratio * 100:.1f}% ± {bound * 100:.1f}% "
+                                        f"({sampling * 100:.1f}% + {scaling * 100:.1f}%)")
+        
+        self.visualize_vm_mrc(results)
+
+    def visualize_vm_mrc(self, results):
+        for i in reversed(range(self.vm_visualization_widget.layout().count())): 
+            self.vm_visualization_widget.layout().itemAt(i).widget().setParent(None)
+        
+        fig = new_figure('vm_mrc')
+        canvas = FigureCanvas(fig)
+        self.vm_visualization_widget.layout().addWidget(canvas)
+        render_vm_mrc(fig, results)
+        canvas.draw()
+
+    def create_vm_playback(self):
+        if self.vm_last_run is None:
+            QMessageBox.critical(self, "Playback Error", "Run a simulation before playing it back")
+            return False
+        if self.vm_playback is None:
+            for i in reversed(range(self.vm_visualization_widget.layout().count())): 
+                self.vm_visualization_widget.layout().itemAt(i).widget().setParent(None)
             
-            self.display_vm_results(results)
+            fig = Figure(figsize=(16, 6))
+            canvas = FigureCanvas(fig)
+            canvas.setMinimumHeight(400)
+            self.vm_visualization_widget.layout().addWidget(canvas)
+            self.vm_playback = VMPlayback(canvas, self.vm_last_run[0])
+            self.vm_playback.set_speed(SPEEDS[self.vm_speed_input.currentText()])
+            self.vm_playback.finished = lambda: self.vm_play_button.setText("Play")
+            canvas.draw()
+        return True
+
+    def toggle_vm_playback(self):
+        if self.vm_playback is not None and self.vm_playback.playing:
+            self.vm_playback.pause()
+            self.vm_play_button.setText("Play")
+        elif self.create_vm_playback():
+            self.vm_playback.play()
+            self.vm_play_button.setText("Pause")
+
+    def step_vm_playback(self):
+        if self.vm_playback is not None and self.vm_playback.playing:
+            self.toggle_vm_playback()
+        if self.create_vm_playback():
+            if self.vm_playback.position >= self.vm_playback.steps:
+                self.vm_playback.rewind()
+            self.vm_playback.step()
+
+    def set_vm_playback_speed(self, text):
+        if self.vm_playback is not None:
+            self.vm_playback.set_speed(SPEEDS[text])
+
+    def stop_vm_playback(self):
+        if self.vm_playback is not None:
+            self.vm_playback.pause()
+            self.vm_playback = None
+        self.vm_play_button.setText("Play")
+
+    def export_vm_results(self):
+        if self.vm_last_run is None:
+            QMessageBox.critical(self, "Export Error", "Run a simulation before exporting")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Results", "", RESULT_FILE_FILTERS)
+        if not path:
+            return
+        results, frames = self.vm_last_run
+        try:
+            export_results(path, results, meta={'frames': frames}, compress=False)
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Export Error", str(e))
+
+    def import_vm_results(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Results", "", RESULT_FILE_FILTERS)
+        if not path:
+            return
+        try:
+            results = as_views(load_results(path))
+            if 'access_type' not in results or 'frames' not in results:
+                raise ValueError("File does not hold virtual memory results")
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Import Error", str(e))
+            return
+        
+        self.stop_vm_playback()
+        frames = results.pop('frames')
+        self.frames_input.setText(str(frames))
+        self.display_vm_results(results)
+        self.visualize_vm_stats(results)
+        if 'ws_size' in results:
+            self.visualize_ws_series(results, frames)
+        self.vm_last_run = (results, frames)
+
+    def toggle_live_trace(self):
+        if self.live_trace is not None:
+            self.stop_live_trace()
+            return
+        try:
+            if not self.frames_input.text().strip().isdigit() or int(self.frames_input.text()) <= 0:
+                raise ValueError("Number of frames must be positive")
+            frames = int(self.frames_input.text())
+            source = self.live_source_input.text().strip()
+            if not source:
+                raise ValueError("Live trace source cannot be empty")
+            if self.fifo_radio.isChecked():
+                algorithm = "FIFO"
+            elif self.second_chance_radio.isChecked():
+                algorithm = "SecondChance"
+            elif self.enhanced_radio.isChecked():
+                algorithm = "EnhancedSecondChance"
+            else:
+                raise ValueError("Live traces are available for FIFO and the Second Chance variants")
+            kind = ('file', 'pipe', 'socket')[self.live_kind_input.currentIndex()]
+            
+            self.live_trace = LiveTrace(source, frames, algorithm, kind, block=self.live_format_input.currentIndex() == 1)
+            self.live_trace.start()
             
         except ValueError as e:
+            self.live_trace = None
             QMessageBox.critical(self, "Input Error", str(e))
+            return
+        
+        self.stop_vm_playback()
+        self.visualize_live_trace(algorithm, frames)
+        self.vm_live_button.setText("Detach Live Trace")
+        self.live_timer.start()
+
+    def stop_live_trace(self):
+        self.live_timer.stop()
+        if self.live_trace is not None:
+            self.live_trace.stop()
+            self.live_trace = None
+        self.vm_live_button.setText("Attach Live Trace")
+
+    def visualize_live_trace(self, algorithm, frames):
+        for i in reversed(range(self.vm_visualization_widget.layout().count())): 
+            self.vm_visualization_widget.layout().itemAt(i).widget().setParent(None)
+        
+        fig = Figure(figsize=(12, 4))
+        self.live_canvas = FigureCanvas(fig)
+        self.vm_visualization_widget.layout().addWidget(self.live_canvas)
+        
+        self.live_ax = fig.add_subplot(111)
+        self.live_line, = self.live_ax.plot([], [], color='#6A1B9A', linewidth=2)
+        self.live_ax.set_title(f"Live {algorithm} with {frames} frames", fontsize=13)
+        self.live_ax.set_xlabel("References", fontsize=12)
+        self.live_ax.set_ylabel(f"Fault Rate (last {self.live_trace.window})", fontsize=12)
+        self.live_ax.set_ylim(0, 1.05)
+        self.live_ax.spines['top'].set_visible(False)
+        self.live_ax.spines['right'].set_visible(False)
+        self.live_ax.grid(True, alpha=0.3)
+        
+        fig.tight_layout()
+        self.live_canvas.draw()
+
+    def update_live_view(self):
+        stats = self.live_trace.snapshot()
+        
+        self.vm_results_text.setPlainText(
+            f"References: {stats['references']}\n"
+            f"Page Faults: {stats['faults']}\n"
+            f"Page Hits: {stats['hits']}\n"
+            f"Fault Rate: {stats['fault_rate'] * 100:.1f}% overall, {stats['window_fault_rate'] * 100:.1f}% recent\n"
+            f"Resident Pages: {stats['resident']}\n"
+            f"Pending Batches: {stats['pending_batches']}  Reader Stalls: {stats['stalls']}  "
+            f"Malformed Lines: {stats['malformed']}")
+        
+        # Only the line's data changes; the axes and labels stay as drawn
+        if stats['history']:
+            references, rates = zip(*stats['history'])
+            self.live_line.set_data(references, rates)
+            self.live_ax.set_xlim(references[0], max(references[-1], references[0] + 1))
+            self.live_canvas.draw_idle()
+        
+        if stats['error']:
+            self.stop_live_trace()
+            QMessageBox.critical(self, "Live Trace Error", stats['error'])
 
     def display_vm_results(self, results):
         self.vm_results_text.clear()
@@ -788,10 +1458,25 @@ class MainWindow(QMainWindow):
         self.vm_results_text.append(f"Total References: {len(results['access_type'])}")
         self.vm_results_text.append(f"Hit Rate: {(results['hits'] / len(results['access_type']) * 100):.1f}%")
         self.vm_results_text.append(f"Fault Rate: {(results['faults'] / len(results['access_type']) * 100):.1f}%\n")
+        if 'prefetches' in results:
+            self.vm_results_text.append(f"Demand Faults without Prefetching: {results['baseline_faults']}")
+            self.vm_results_text.append(f"Faults Removed by Prefetching: {results['faults_removed']}")
+            self.vm_results_text.append(f"Prefetches: {results['prefetches']} ({results['useful_prefetches']} used, "
+                                        f"{results['polluting_prefetches']} evicted unused)")
+            self.vm_results_text.append(f"Accuracy: {results['accuracy'] * 100:.1f}%  Coverage: {results['coverage'] * 100:.1f}%  "
+                                        f"Pollution: {results['pollution'] * 100:.1f}%\n")
+        if 'ws_size' in results:
+            self.vm_results_text.append(f"Working Set Size: mean {np.mean(results['ws_size']):.1f}, peak {np.max(results['ws_size'])}\n")
+        if 'dirty_evictions' in results:
+            self.vm_results_text.append(f"Clean Evictions: {results['clean_evictions']}")
+            self.vm_results_text.append(f"Dirty Evictions (write-back): {results['dirty_evictions']}")
+            self.vm_results_text.append(f"I/O Cost: {results['io_cost']:.1f}\n")
         self.vm_results_text.append("Allocation Sequence:")
         
-        for step in results['sequence']:
+        for step in results['sequence'][:SHOWN_STEPS]:
             self.vm_results_text.append(str(step))
+        if len(results['sequence']) > SHOWN_STEPS:
+            self.vm_results_text.append(f"... {len(results['sequence']) - SHOWN_STEPS} more steps")
         
         self.visualize_vm_results(results)
 
@@ -800,105 +1485,41 @@ class MainWindow(QMainWindow):
         for i in reversed(range(self.vm_visualization_widget.layout().count())): 
             self.vm_visualization_widget.layout().itemAt(i).widget().setParent(None)
         
-        
-        fig = plt.figure(figsize=(16, 10))  
-        
-      
-        ax1 = plt.subplot2grid((5, 1), (0, 0), rowspan=4)  
-        sequence = results['sequence']
-        frames = len(sequence[0])
-        steps = len(sequence)
-        access_type = results['access_type']
-        ref_string = results['ref_string']
-        
-        
-        is_second_chance = 'reference_bits' in results
-        ref_bits = results.get('reference_bits', None)
-        
-       
-        ax1.set_xlim(-1, steps)  
-        ax1.set_ylim(frames - 0.5, -2.2 if is_second_chance else -1.8)  
-        
-      
-        ax1.spines['top'].set_visible(False)
-        ax1.spines['right'].set_visible(False)
-        ax1.spines['bottom'].set_visible(True)  
-        ax1.spines['left'].set_visible(False)
-        ax1.set_xticks([])
-        ax1.set_yticks([])
-        
-       
-        for i in range(steps):
-           
-            color = '#117711' if access_type[i] else '#990000'
-            indicator = 'H' if access_type[i] else 'F'
-            ax1.text(i, -1.2, indicator, ha='center', va='center', 
-                    fontsize=12, color=color, fontweight='bold')
-            
-          
-            ref_value = ref_string[i] if i < len(ref_string) else sequence[i][-1]
-            ax1.text(i, -0.8, str(ref_value), ha='center', va='center',
-                    fontsize=12, fontweight='bold')
-        
-        
-        for step in range(steps):
-            for frame in range(frames):
-                page = sequence[step][frame]
-                if page is not None:
-                  
-                    color = '#AAFFAA' if access_type[step] else '#FFAAAA' 
-                    rect = plt.Rectangle((step - 0.4, frame - 0.4), 0.8, 0.8, 
-                                      fill=True, facecolor=color, 
-                                      edgecolor='black', alpha=0.7)
-                    ax1.add_patch(rect)
-                    
-                    ax1.text(step, frame, str(page), ha='center', va='center', 
-                           fontsize=12, fontweight='bold')
-                    
-                  
-                    if is_second_chance and ref_bits and ref_bits[step][frame] == 1:
-                        ax1.text(step + 0.3, frame - 0.3, "★", ha='center', va='center',
-                                fontsize=8, color='#0000FF')
-                
-             
-                rect = plt.Rectangle((step - 0.5, frame - 0.5), 1, 1, 
-                                   fill=False, edgecolor='black', linewidth=0.5)
-                ax1.add_patch(rect)
-        
-       
-        ax1.text(-0.8, -0.8, "Ref:", ha='right', va='center', fontsize=12, fontweight='bold')
-        ax1.text(-0.8, -1.2, "Status:", ha='right', va='center', fontsize=12, fontweight='bold')
-        
-      
-        ax2 = plt.subplot2grid((5, 1), (4, 0))
-        ax2.axis('off')
-        
-        
-        legend_x = 0.2  
-        ax2.add_patch(plt.Rectangle((legend_x, 0.5), 0.1, 0.3, facecolor='#AAFFAA', alpha=0.7))
-        ax2.text(legend_x + 0.15, 0.65, "Hit", va='center', fontsize=12)
-        
-        ax2.add_patch(plt.Rectangle((legend_x + 0.3, 0.5), 0.1, 0.3, facecolor='#FFAAAA', alpha=0.7))
-        ax2.text(legend_x + 0.45, 0.65, "Fault", va='center', fontsize=12)
-        
-       
-        if is_second_chance:
-            ax2.text(legend_x + 0.7, 0.65, "★ = Second Chance (Ref bit = 1)", va='center', fontsize=12, color='#0000FF')
-        
-       
-        ax1.set_aspect('equal')
-        
-       
-        plt.subplots_adjust(left=0.1, right=0.9, top=0.95, bottom=0.1, hspace=0.2)  
-        
-       
+        fig = new_figure('vm_grid')
         canvas = FigureCanvas(fig)
         self.vm_visualization_widget.layout().addWidget(canvas)
+        render_vm_grid(fig, first_steps(results, GRID_STEPS))
+        canvas.draw()
+
+    def visualize_ws_series(self, results, frames):
+        fig = new_figure('ws_series')
+        canvas = FigureCanvas(fig)
+        canvas.setMinimumHeight(250)
+        self.vm_visualization_widget.layout().addWidget(canvas)
+        render_ws_series(fig, results, frames)
+        canvas.draw()
+
+    def visualize_vm_stats(self, results):
+        fig = new_figure('vm_stats')
+        canvas = FigureCanvas(fig)
+        canvas.setMinimumHeight(250)
+        self.vm_visualization_widget.layout().addWidget(canvas)
+        render_vm_stats(fig, results)
         canvas.draw()
 
     def reset_vm(self):
+        self.stop_vm_playback()
+        self.stop_live_trace()
+        self.live_source_input.clear()
+        self.live_kind_input.setCurrentIndex(0)
+        self.live_format_input.setCurrentIndex(0)
         self.frames_input.clear()
         self.ref_input.clear()
+        self.sample_rate_input.setText("1.0")
+        self.target_rate_input.setText("10")
+        self.tau_input.setText("4")
+        self.prefetcher_input.setCurrentIndex(0)
+        self.vm_last_run = None
         self.vm_results_text.clear()
         self.fifo_radio.setChecked(True)
         
@@ -906,54 +1527,107 @@ class MainWindow(QMainWindow):
         for i in reversed(range(self.vm_visualization_widget.layout().count())): 
             self.vm_visualization_widget.layout().itemAt(i).widget().setParent(None)
 
+    def read_ds_inputs(self):
+        if not self.cylinders_input.text().strip().isdigit():
+            raise ValueError("Number of cylinders must contain only numbers")
+        cylinders = int(self.cylinders_input.text())
+        if cylinders <= 0:
+            raise ValueError("Number of cylinders must be positive")
+
+        if not self.current_pos_input.text().strip().isdigit():
+            raise ValueError("Current position must contain only numbers")
+        current_pos = int(self.current_pos_input.text())
+        if current_pos < 0 or current_pos >= cylinders:
+            raise ValueError("Current position must be between 0 and number of cylinders")
+            
+        queue_text = self.queue_input.text().strip()
+        if not queue_text:
+            raise ValueError("Request queue cannot be empty")
+        if queue_text.startswith(',') or queue_text.endswith(','):
+            raise ValueError("Request queue should not start or end with a comma")
+        if ',,' in queue_text:
+            raise ValueError("Request queue should not contain consecutive commas")
+        
+        queue_parts = queue_text.split(',')
+        for part in queue_parts:
+            if not part.strip().isdigit():
+                raise ValueError("Request queue must contain only numbers")
+        queue = [int(x.strip()) for x in queue_parts]
+        if not all(0 <= x < cylinders for x in queue):
+            raise ValueError("All queue values must be between 0 and number of cylinders")
+        
+        algorithm = "SCAN" if self.scan_radio.isChecked() else "LOOK"
+        return cylinders, current_pos, queue, algorithm
+
     def run_ds_simulation(self):
+        self.stop_ds_playback()
         try:
-            if not self.cylinders_input.text().strip().isdigit():
-                raise ValueError("Number of cylinders must contain only numbers")
-            cylinders = int(self.cylinders_input.text())
-            if cylinders <= 0:
-                raise ValueError("Number of cylinders must be positive")
-
-            if not self.current_pos_input.text().strip().isdigit():
-                raise ValueError("Current position must contain only numbers")
-            current_pos = int(self.current_pos_input.text())
-            if current_pos < 0 or current_pos >= cylinders:
-                raise ValueError("Current position must be between 0 and number of cylinders")
-                
-            queue_text = self.queue_input.text().strip()
-            if not queue_text:
-                raise ValueError("Request queue cannot be empty")
-            if queue_text.startswith(',') or queue_text.endswith(','):
-                raise ValueError("Request queue should not start or end with a comma")
-            if ',,' in queue_text:
-                raise ValueError("Request queue should not contain consecutive commas")
-            
-            queue_parts = queue_text.split(',')
-            for part in queue_parts:
-                if not part.strip().isdigit():
-                    raise ValueError("Request queue must contain only numbers")
-            queue = [int(x.strip()) for x in queue_parts]
-            if not all(0 <= x < cylinders for x in queue):
-                raise ValueError("All queue values must be between 0 and number of cylinders")
-            
-            algorithm = "SCAN" if self.scan_radio.isChecked() else "LOOK"
+            cylinders, current_pos, queue, algorithm = self.read_ds_inputs()
             direction = "right"  
             
+            model = None
+            if self.drive_profile_input.currentIndex() > 0:
+                model = DiskModel.from_profile(self.drive_profile_input.currentText(), cylinders)
+            
             if algorithm == "SCAN":
-                results = SCAN(queue, current_pos, cylinders, direction)
+                results = SCAN(queue, current_pos, cylinders, direction, model)
             else:
-                results = LOOK(queue, current_pos, direction)
+                results = LOOK(queue, current_pos, direction, model)
             
             self.display_ds_results(results)
+            self.visualize_ds_stats(results, current_pos)
+            self.ds_last_run = (results, cylinders, current_pos)
             
         except ValueError as e:
             QMessageBox.critical(self, "Input Error", str(e))
 
+    def run_ds_sweep(self):
+        self.stop_ds_playback()
+        try:
+            cylinders, current_pos, queue, algorithm = self.read_ds_inputs()
+            results = SeekSweep(queue, cylinders)
+            self.display_ds_sweep(results, current_pos, algorithm)
+            
+        except ValueError as e:
+            QMessageBox.critical(self, "Input Error", str(e))
+
+    def display_ds_sweep(self, results, current_pos, algorithm):
+        key = algorithm.lower()
+        self.ds_results_text.clear()
+        self.ds_results_text.append(f"{algorithm} seek distance from position {current_pos}:")
+        self.ds_results_text.append(f"  Moving right: {results[key + '_right'][current_pos]}")
+        self.ds_results_text.append(f"  Moving left: {results[key + '_left'][current_pos]}\n")
+        for direction in ('right', 'left'):
+            distances = results[key + '_' + direction]
+            best = int(np.argmin(distances))
+            self.ds_results_text.append(f"Best start moving {direction}: cylinder {best} ({distances[best]}), "
+                                        f"worst: {int(distances.max())}, mean: {distances.mean():.1f}")
+        
+        self.visualize_ds_sweep(results, current_pos, algorithm)
+
+    def visualize_ds_sweep(self, results, current_pos, algorithm):
+        for i in reversed(range(self.ds_visualization_widget.layout().count())): 
+            self.ds_visualization_widget.layout().itemAt(i).widget().setParent(None)
+        
+        fig = new_figure('ds_sweep')
+        canvas = FigureCanvas(fig)
+        self.ds_visualization_widget.layout().addWidget(canvas)
+        render_ds_sweep(fig, results, current_pos, algorithm)
+        canvas.draw()
+
     def display_ds_results(self, results):
         self.ds_results_text.clear()
         self.ds_results_text.append(f"Total Seek Distance: {results['seek_distance']}")
         self.ds_results_text.append("Order of Served Requests:")
-        self.ds_results_text.append(str(results['sequence']))
+        self.ds_results_text.append(str(list(results['sequence'][:SHOWN_STEPS])))
+        if len(results['sequence']) > SHOWN_STEPS:
+            self.ds_results_text.append(f"... {len(results['sequence']) - SHOWN_STEPS} more requests")
+        
+        if 'service_times' in results:
+            self.ds_results_text.append(f"\nTotal Service Time: {results['total_service_time']:.2f} ms")
+            self.ds_results_text.append(f"Throughput: {results['iops']:.1f} IOPS")
+            self.ds_results_text.append("Service Time per Request (ms):")
+            self.ds_results_text.append(", ".join(f"{r}: {t:.2f}" for r, t in zip(serviced_requests(results)[:SHOWN_STEPS], results['service_times'][:SHOWN_STEPS])))
         
         self.visualize_ds_results(results)
 
@@ -962,67 +1636,106 @@ class MainWindow(QMainWindow):
         for i in reversed(range(self.ds_visualization_widget.layout().count())): 
             self.ds_visualization_widget.layout().itemAt(i).widget().setParent(None)
         
-       
-        fig = plt.figure(figsize=(12, 6))
+        fig = new_figure('ds_path')
         canvas = FigureCanvas(fig)
         self.ds_visualization_widget.layout().addWidget(canvas)
-        
-        ax = fig.add_subplot(111)
-        sequence = results['sequence']
-        
-     
-        cylinders = int(self.cylinders_input.text())
-        
-       
-        positions = sorted(set([0, cylinders - 1] + list(sequence)))
-        x_positions = np.linspace(0, 1, len(positions))
-        pos_to_x = dict(zip(positions, x_positions))
-        
-        
-        for pos, x in zip(positions, x_positions):
-            ax.text(x, 1.1, str(pos), ha='center', va='bottom', color='orange', fontsize=10)
-        
-       
-        x_coords = []
-        y_coords = []
-        y_spacing = 0.05  
-        current_y = 0.8 
-        
-        
-        x_coords.append(pos_to_x[sequence[0]])
-        y_coords.append(current_y)
-        
-       
-        for i in range(1, len(sequence)):
-            current_y -= y_spacing
-            x_coords.append(pos_to_x[sequence[i]])
-            y_coords.append(current_y)
-        
-      
-        ax.plot(x_coords, y_coords, 'k-', linewidth=1)
-        ax.plot(x_coords, y_coords, 'ko', markersize=8)
-        
-       
-        ax.set_xticks([])
-        ax.set_yticks([])
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['bottom'].set_visible(False)
-        ax.spines['left'].set_visible(False)
-        
-        
-        ax.set_xlim(-0.05, 1.05)
-        ax.set_ylim(0.2, 1.2)
-        
-        
-        plt.subplots_adjust(left=0.02, right=0.98, top=0.95, bottom=0.05)
-        
+        render_ds_path(fig, results, int(self.current_pos_input.text()), int(self.cylinders_input.text()))
+        canvas.draw()
+
+    def create_ds_playback(self):
+        if self.ds_last_run is None:
+            QMessageBox.critical(self, "Playback Error", "Run a simulation before playing it back")
+            return False
+        if self.ds_playback is None:
+            for i in reversed(range(self.ds_visualization_widget.layout().count())): 
+                self.ds_visualization_widget.layout().itemAt(i).widget().setParent(None)
+            
+            fig = Figure(figsize=(12, 6))
+            canvas = FigureCanvas(fig)
+            canvas.setMinimumHeight(400)
+            self.ds_visualization_widget.layout().addWidget(canvas)
+            results, cylinders, current_pos = self.ds_last_run
+            self.ds_playback = DiskPlayback(canvas, results, current_pos, cylinders)
+            self.ds_playback.set_speed(SPEEDS[self.ds_speed_input.currentText()])
+            self.ds_playback.finished = lambda: self.ds_play_button.setText("Play")
+            canvas.draw()
+        return True
+
+    def toggle_ds_playback(self):
+        if self.ds_playback is not None and self.ds_playback.playing:
+            self.ds_playback.pause()
+            self.ds_play_button.setText("Play")
+        elif self.create_ds_playback():
+            self.ds_playback.play()
+            self.ds_play_button.setText("Pause")
+
+    def step_ds_playback(self):
+        if self.ds_playback is not None and self.ds_playback.playing:
+            self.toggle_ds_playback()
+        if self.create_ds_playback():
+            if self.ds_playback.position >= self.ds_playback.steps:
+                self.ds_playback.rewind()
+            self.ds_playback.step()
+
+    def set_ds_playback_speed(self, text):
+        if self.ds_playback is not None:
+            self.ds_playback.set_speed(SPEEDS[text])
+
+    def stop_ds_playback(self):
+        if self.ds_playback is not None:
+            self.ds_playback.pause()
+            self.ds_playback = None
+        self.ds_play_button.setText("Play")
+
+    def export_ds_results(self):
+        if self.ds_last_run is None:
+            QMessageBox.critical(self, "Export Error", "Run a simulation before exporting")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Results", "", RESULT_FILE_FILTERS)
+        if not path:
+            return
+        results, cylinders, current_pos = self.ds_last_run
+        try:
+            export_results(path, results, meta={'cylinders': cylinders, 'head_start': current_pos}, compress=False)
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Export Error", str(e))
+
+    def import_ds_results(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Results", "", RESULT_FILE_FILTERS)
+        if not path:
+            return
+        try:
+            results = as_views(load_results(path))
+            if 'seek_distance' not in results or 'cylinders' not in results:
+                raise ValueError("File does not hold disk scheduling results")
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, "Import Error", str(e))
+            return
+        
+        self.stop_ds_playback()
+        cylinders = results.pop('cylinders')
+        current_pos = results.pop('head_start')
+        self.cylinders_input.setText(str(cylinders))
+        self.current_pos_input.setText(str(current_pos))
+        self.display_ds_results(results)
+        self.visualize_ds_stats(results, current_pos)
+        self.ds_last_run = (results, cylinders, current_pos)
+
+    def visualize_ds_stats(self, results, current_pos):
+        fig = new_figure('ds_stats')
+        canvas = FigureCanvas(fig)
+        canvas.setMinimumHeight(250)
+        self.ds_visualization_widget.layout().addWidget(canvas)
+        render_ds_stats(fig, results, current_pos)
         canvas.draw()
 
     def reset_ds(self):
+        self.stop_ds_playback()
         self.cylinders_input.clear()
         self.current_pos_input.clear()
         self.queue_input.clear()
+        self.drive_profile_input.setCurrentIndex(0)
+        self.ds_last_run = None
         self.ds_results_text.clear()
         self.scan_radio.setChecked(True)
         
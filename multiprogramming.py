@@ -0,0 +1,178 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from virtual_memory import ENGINES, RunAccessTypes, compact_references
+
+
+def load_trace(trace):
+    # trace: iterable of (pid, page) pairs in the order the CPU issued them
+    pairs = np.asarray(list(trace), dtype=np.int64).reshape(-1, 2)
+    if len(pairs) == 0:
+        raise ValueError("Trace cannot be empty")
+    if (pairs[:, 1] < 0).any():
+        raise ValueError("Page numbers must be non-negative")
+    return pairs[:, 0], pairs[:, 1]
+
+
+def _run_local(args):
+    algorithm, frames, pages = args
+    engine = ENGINES[algorithm](frames)
+    runs, counts, _ = compact_references(pages)
+    run_hits = np.fromiter((engine.access(page) for page in runs.tolist()), dtype=bool, count=len(runs))
+    return RunAccessTypes(counts, run_hits).to_array()
+
+
+class _ResizableSet:
+    # Per-process resident set for PFF: FIFO order, with a reference bit for SecondChance
+
+    def __init__(self, algorithm):
+        self.second_chance = algorithm == "SecondChance"
+        self.pages = OrderedDict()
+
+    def __len__(self):
+        return len(self.pages)
+
+    def access(self, page):
+        if page in self.pages:
+            self.pages[page] = 1
+            return True
+        return False
+
+    def load(self, page):
+        self.pages[page] = 1
+
+    def evict(self):
+        while True:
+            page, bit = self.pages.popitem(last=False)
+            if not (self.second_chance and bit):
+                return page
+            # Give second chance
+            self.pages[page] = 0
+
+
+def _shares(frames, weights):
+    # Split frames in proportion to weights, at least one each, remainder to the largest
+    weights = np.asarray(weights, dtype=np.float64)
+    shares = np.maximum(1, np.floor(frames * weights / weights.sum())).astype(np.int64)
+    while shares.sum() > frames:
+        shares[np.argmax(shares)] -= 1
+    remainder = frames - shares.sum()
+    for i in np.argsort(-weights, kind='stable')[:remainder]:
+        shares[i] += 1
+    return shares
+
+
+def _thrashing_periods(hits, window, threshold):
+    faults = np.concatenate(([0], np.cumsum(~hits)))
+    if len(hits) < window:
+        return []
+    rate = (faults[window:] - faults[:-window]) / window
+    over = np.concatenate(([False], rate > threshold, [False]))
+    edges = np.flatnonzero(np.diff(over.astype(np.int8)))
+    # Report periods as reference indices covered by the overloaded windows
+    return [(int(start), int(end) + window - 2) for start, end in zip(edges[::2], edges[1::2])]
+
+
+def Multiprogram(trace, frames, algorithm="FIFO", scope="local", allocation="equal", workers=None,
+                 pff_window=20, pff_low=0.05, pff_high=0.3, thrash_window=100, thrash_threshold=0.5):
+    if algorithm not in ("FIFO", "SecondChance"):
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if scope not in ("local", "global"):
+        raise ValueError("Replacement scope must be 'local' or 'global'")
+    if allocation not in ("equal", "proportional", "pff"):
+        raise ValueError("Allocation must be 'equal', 'proportional' or 'pff'")
+
+    pids, pages = load_trace(trace)
+    process_ids, proc = np.unique(pids, return_inverse=True)
+    count = len(process_ids)
+    if scope == "local" and frames < count:
+        raise ValueError("Local replacement needs at least one frame per process")
+
+    allocated = None
+    if scope == "global":
+        # One engine over (pid, page) keys: any process may take any frame
+        engine = ENGINES[algorithm](frames)
+        keys = (proc.astype(np.int64) << 40 | pages).tolist()
+        hits = np.fromiter((engine.access(key) for key in keys), dtype=bool, count=len(keys))
+    elif allocation == "pff":
+        hits, allocated = _simulate_pff(proc, pages, count, frames, algorithm, pff_window, pff_low, pff_high)
+    else:
+        # Fixed local partitions never interact, so each process runs on its own worker
+        order = np.argsort(proc, kind='stable')
+        bounds = np.searchsorted(proc[order], np.arange(count + 1))
+        streams = [pages[order[bounds[p]:bounds[p + 1]]] for p in range(count)]
+        if allocation == "equal":
+            allocated = _shares(frames, np.ones(count))
+        else:
+            allocated = _shares(frames, [len(np.unique(stream)) for stream in streams])
+        tasks = [(algorithm, int(allocated[p]), streams[p]) for p in range(count)]
+        workers = min(count, os.cpu_count() or 1) if workers is None else workers
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_run_local, tasks))
+        else:
+            outcomes = [_run_local(task) for task in tasks]
+        hits = np.empty(len(pages), dtype=bool)
+        hits[order] = np.concatenate(outcomes)
+
+    references = np.bincount(proc, minlength=count)
+    faults = np.bincount(proc, weights=~hits, minlength=count).astype(np.int64)
+    processes = {}
+    for p, pid in enumerate(process_ids.tolist()):
+        processes[pid] = {
+            'references': int(references[p]),
+            'faults': int(faults[p]),
+            'fault_rate': float(faults[p] / references[p]),
+            'frames': None if allocated is None else int(allocated[p]),
+        }
+
+    periods = _thrashing_periods(hits, thrash_window, thrash_threshold)
+    return {
+        'processes': processes,
+        'references': len(pages),
+        'faults': int(faults.sum()),
+        'hits': int(hits.sum()),
+        'fault_rate': float(faults.sum() / len(pages)),
+        'access_type': hits,
+        'thrashing': bool(periods),
+        'thrashing_periods': periods,
+        'scope': scope,
+        'allocation': allocation if scope == "local" else None,
+    }
+
+
+def _simulate_pff(proc, pages, count, frames, algorithm, window, low, high):
+    # Page-fault-frequency allocation: every window references a process's fault rate is
+    # checked, above high it gets a free frame, below low it gives one back; half the pool
+    # starts free so demand has somewhere to grow
+    allocated = _shares(max(count, frames // 2), np.ones(count))
+    free = frames - int(allocated.sum())
+    resident = [_ResizableSet(algorithm) for _ in range(count)]
+    seen = [0] * count
+    recent = [0] * count
+    hits = np.empty(len(pages), dtype=bool)
+
+    for i, (p, page) in enumerate(zip(proc.tolist(), pages.tolist())):
+        frames_p = resident[p]
+        hit = frames_p.access(page)
+        hits[i] = hit
+        if not hit:
+            recent[p] += 1
+            if len(frames_p) >= allocated[p]:
+                frames_p.evict()
+            frames_p.load(page)
+        seen[p] += 1
+        if seen[p] % window == 0:
+            rate = recent[p] / window
+            recent[p] = 0
+            if rate > high and free > 0:
+                allocated[p] += 1
+                free -= 1
+            elif rate < low and allocated[p] > 1:
+                allocated[p] -= 1
+                free += 1
+                if len(frames_p) > allocated[p]:
+                    frames_p.evict()
+
+    return hits, allocated
@@ -0,0 +1,152 @@
+import itertools
+from collections import deque
+import numpy as np
+from virtual_memory import ENGINES
+from disk_model import DiskModel
+from disk_scheduling import SCAN, LOOK
+
+
+class SwapLayout:
+    # Maps a swapped page to (cylinder, sector) inside the swap area
+
+    def __init__(self, model, start_cylinder=0, cylinders=None, sectors_per_page=8, mode="linear"):
+        if mode not in ("linear", "hashed"):
+            raise ValueError("Swap layout must be 'linear' or 'hashed'")
+        cylinders = model.cylinders - start_cylinder if cylinders is None else cylinders
+        if cylinders <= 0 or start_cylinder < 0 or start_cylinder + cylinders > model.cylinders:
+            raise ValueError("Swap area must lie within the disk")
+        self.start_cylinder = start_cylinder
+        self.cylinders = cylinders
+        self.sectors_per_page = sectors_per_page
+        self.sectors_per_track = model.sectors_per_track
+        self.pages_per_cylinder = max(1, model.sectors_per_track // sectors_per_page)
+        self.slots = self.cylinders * self.pages_per_cylinder
+        self.mode = mode
+
+    def locate(self, page):
+        # linear packs consecutive pages together, hashed scatters them like a fragmented swap file
+        slot = page if self.mode == "linear" else (page * 2654435761) & 0xFFFFFFFF
+        slot %= self.slots
+        cylinder, index = divmod(slot, self.pages_per_cylinder)
+        return self.start_cylinder + cylinder, index * self.sectors_per_page
+
+
+def page_faults(frames, ref_string, algorithm="FIFO", writes=None, stats=None):
+    # Stage 1: yield ('R', page) for each fault and ('W', page) for each dirty eviction
+    engine = ENGINES[algorithm](frames)
+    dirty = set()
+    stats = {} if stats is None else stats
+    stats.update(references=0, hits=0, faults=0, write_backs=0)
+    flags = itertools.repeat(False) if writes is None else writes
+    for page, is_write in zip(ref_string, flags):
+        stats['references'] += 1
+        if engine.access(page, is_write):
+            stats['hits'] += 1
+        else:
+            stats['faults'] += 1
+            evicted = engine.evicted
+            if evicted is not None and evicted in dirty:
+                dirty.discard(evicted)
+                stats['write_backs'] += 1
+                yield 'W', evicted
+            yield 'R', page
+        if is_write:
+            dirty.add(page)
+
+
+def swap_requests(faults, layout):
+    # Stage 2: attach the swap location of each page
+    for kind, page in faults:
+        cylinder, sector = layout.locate(page)
+        yield kind, page, cylinder, sector
+
+
+def schedule_stream(requests, model, head_start=0, scheduler="SCAN", queue_depth=8, sectors_per_page=8):
+    # Stage 3: elevator-schedule each window of queue_depth requests and yield completions
+    # as (kind, page, cylinder, latency_ms) with latency measured from the window's dispatch;
+    # head movements that service nothing are yielded with kind None
+    head, head_sector = head_start, 0
+    direction = "right"
+    while True:
+        window = list(itertools.islice(requests, queue_depth))
+        if not window:
+            return
+        waiting = {}
+        for request in window:
+            waiting.setdefault(request[2], deque()).append(request)
+        cylinders = [request[2] for request in window]
+        if scheduler == "SCAN":
+            plan = SCAN(cylinders, head, model.cylinders, direction)
+        else:
+            plan = LOOK(cylinders, head, direction)
+
+        elapsed = 0.0
+        for cylinder, serviced in zip(plan['head_path'], plan['serviced']):
+            if serviced:
+                kind, page, _, sector = waiting[cylinder].popleft()
+                service, head_sector = model.request_time(head, head_sector, cylinder, sector, sectors_per_page)
+                elapsed += service
+                yield kind, page, cylinder, elapsed
+            else:
+                # SCAN's turnaround and sweep to the end of the disk service nothing; the
+                # platter keeps turning while the head travels
+                travel = max(model.seek_ms(cylinder - head) - model.settle_ms, 0.0)
+                elapsed += travel
+                head_sector = (head_sector + travel / model.rotation_ms * model.sectors_per_track) % \
+                    model.sectors_per_track
+                yield None, None, cylinder, elapsed
+            if cylinder != head:
+                direction = "right" if cylinder > head else "left"
+            head = cylinder
+
+
+def PagingToDisk(frames, ref_string, algorithm="FIFO", scheduler="SCAN", writes=None, model=None,
+                 layout=None, head_start=0, queue_depth=8, memory_ns=100.0, fault_overhead_ms=0.01):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if scheduler not in ("SCAN", "LOOK"):
+        raise ValueError(f"Unknown scheduler: {scheduler}")
+    if writes is not None and len(writes) != len(ref_string):
+        raise ValueError("Write flags must match the reference string")
+    model = DiskModel.from_profile('desktop_7200', 1000) if model is None else model
+    layout = SwapLayout(model) if layout is None else layout
+
+    stats = {}
+    faults = page_faults(frames, ref_string, algorithm, writes, stats)
+    requests = swap_requests(faults, layout)
+    completions = schedule_stream(requests, model, head_start, scheduler, queue_depth, layout.sectors_per_page)
+
+    fault_latencies = []
+    write_latencies = []
+    seek_distance = 0
+    head = head_start
+    for kind, page, cylinder, latency in completions:
+        seek_distance += abs(cylinder - head)
+        head = cylinder
+        if kind is None:
+            continue
+        if kind == 'R':
+            fault_latencies.append(latency + fault_overhead_ms)
+        else:
+            write_latencies.append(latency)
+
+    references = stats['references']
+    if references == 0:
+        raise ValueError("Reference string cannot be empty")
+    fault_latencies = np.array(fault_latencies)
+    # Every reference pays a memory access; faults add their end-to-end swap-in latency
+    total_ns = references * memory_ns + fault_latencies.sum() * 1e6
+    p50, p99, p999 = np.percentile(fault_latencies, [50, 99, 99.9]) if fault_latencies.size else (0.0, 0.0, 0.0)
+
+    return {
+        'faults': stats['faults'],
+        'hits': stats['hits'],
+        'write_backs': stats['write_backs'],
+        'effective_access_time_ns': float(total_ns / references),
+        'fault_latencies': fault_latencies,
+        'write_latencies': np.array(write_latencies),
+        'latency_p50': float(p50),
+        'latency_p99': float(p99),
+        'latency_p999': float(p999),
+        'seek_distance': seek_distance,
+    }
@@ -0,0 +1,207 @@
+from PyQt6.QtCore import QTimer
+from matplotlib.lines import Line2D
+from matplotlib.patches import Rectangle
+import numpy as np
+from trace_stats import ds_series
+
+
+SPEEDS = {
+    '2 steps/s': 2,
+    '5 steps/s': 5,
+    '15 steps/s': 15,
+    '30 steps/s': 30,
+    '60 steps/s': 60,
+}
+
+# Page numbers and bit markers are only drawn while the cells are big enough to read them
+_LABEL_STEPS = 60
+
+
+class _Playback:
+    # Blitted playback: each tick restores the saved background, draws only the newly revealed
+    # step, saves the result as the new background and draws the animated cursor and counters
+    # on top. A full redraw (resize, first show) recaptures the background.
+
+    def __init__(self, canvas, steps):
+        self.canvas = canvas
+        self.figure = canvas.figure
+        self.steps = steps
+        self.position = 0
+        self.speed = 5
+        self.revealed = []
+        self.background = None
+        self.finished = None
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.step)
+        self.canvas.mpl_connect('draw_event', self._capture)
+
+    @property
+    def playing(self):
+        return self.timer.isActive()
+
+    def _capture(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_overlay()
+
+    def _draw_overlay(self):
+        self._update_overlay()
+        for artist in self.overlay:
+            self.figure.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
+    def set_speed(self, steps_per_second):
+        self.speed = steps_per_second
+        self.timer.setInterval(max(1, int(1000 / steps_per_second)))
+
+    def play(self):
+        if self.position >= self.steps:
+            self.rewind()
+        self.set_speed(self.speed)
+        self.timer.start()
+
+    def pause(self):
+        self.timer.stop()
+
+    def rewind(self):
+        self.pause()
+        for artist in self.revealed:
+            artist.remove()
+        self.revealed = []
+        self.position = 0
+        self.canvas.draw()
+
+    def step(self):
+        if self.position >= self.steps:
+            self.pause()
+            return False
+        if self.background is None:
+            self.canvas.draw()
+        self.canvas.restore_region(self.background)
+        for artist in self._reveal(self.position):
+            self.revealed.append(artist)
+            self.figure.draw_artist(artist)
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.position += 1
+        self._draw_overlay()
+        if self.position >= self.steps:
+            self.pause()
+            if self.finished is not None:
+                self.finished()
+        return True
+
+
+class VMPlayback(_Playback):
+
+    def __init__(self, canvas, results):
+        sequence = results['sequence']
+        super().__init__(canvas, len(sequence))
+        self.sequence = sequence
+        self.frames = len(sequence[0])
+        self.access_type = results['access_type']
+        self.ref_string = results['ref_string']
+        self.writes = results.get('writes')
+        self.ref_bits = results.get('reference_bits')
+        self.modify_bits = results.get('modify_bits')
+        self.labels = self.steps <= _LABEL_STEPS
+        self.faults_so_far = np.concatenate(([0], np.cumsum(~np.asarray(self.access_type, dtype=bool))))
+
+        self.figure.clear()
+        ax = self.ax = self.figure.add_subplot(111)
+        ax.set_xlim(-0.5, self.steps - 0.5)
+        ax.set_ylim(self.frames - 0.5, -1.6)
+        for spine in ('top', 'right', 'left'):
+            ax.spines[spine].set_visible(False)
+        ax.set_xticks([])
+        ax.set_yticks([])
+        ax.vlines(np.arange(-0.5, self.steps), -0.5, self.frames - 0.5, colors='black', linewidth=0.5)
+        ax.hlines(np.arange(-0.5, self.frames), -0.5, self.steps - 0.5, colors='black', linewidth=0.5)
+        ax.text(-0.01, -0.8, "Ref:", transform=ax.get_yaxis_transform(), ha='right', va='center',
+                fontsize=12, fontweight='bold')
+        ax.text(-0.01, -1.2, "Status:", transform=ax.get_yaxis_transform(), ha='right', va='center',
+                fontsize=12, fontweight='bold')
+
+        self.cursor = Rectangle((-0.5, -1.5), 1, self.frames + 1, fill=False, edgecolor='#1565C0',
+                                linewidth=2, animated=True)
+        ax.add_patch(self.cursor)
+        self.counter = ax.text(1.0, 1.02, "", transform=ax.transAxes, ha='right', va='bottom',
+                               fontsize=12, fontweight='bold', animated=True)
+        self.overlay = [self.cursor, self.counter]
+        self.figure.subplots_adjust(left=0.1, right=0.95, top=0.9, bottom=0.05)
+
+    def _update_overlay(self):
+        step = self.position - 1
+        self.cursor.set_visible(step >= 0)
+        self.cursor.set_x(step - 0.5)
+        faults = int(self.faults_so_far[self.position])
+        self.counter.set_text(f"Step {self.position}/{self.steps}   Faults {faults}   Hits {self.position - faults}")
+
+    def _reveal(self, step):
+        ax = self.ax
+        hit = self.access_type[step]
+        color = '#AAFFAA' if hit else '#FFAAAA'
+        artists = [ax.add_patch(Rectangle((step - 0.4, -1.4), 0.8, 0.4, facecolor='#117711' if hit else '#990000'))]
+        if self.labels:
+            ref_value = self.ref_string[step] if step < len(self.ref_string) else self.sequence[step][-1]
+            if self.writes and self.writes[step]:
+                ref_value = f"{ref_value}w"
+            artists.append(ax.text(step, -0.8, str(ref_value), ha='center', va='center', fontsize=12, fontweight='bold'))
+        for frame, page in enumerate(self.sequence[step]):
+            if page is None:
+                continue
+            artists.append(ax.add_patch(Rectangle((step - 0.4, frame - 0.4), 0.8, 0.8, facecolor=color,
+                                                  edgecolor='black', alpha=0.7)))
+            if not self.labels:
+                continue
+            artists.append(ax.text(step, frame, str(page), ha='center', va='center', fontsize=12, fontweight='bold'))
+            if self.ref_bits and self.ref_bits[step][frame] == 1:
+                artists.append(ax.text(step + 0.3, frame - 0.3, "★", ha='center', va='center',
+                                       fontsize=8, color='#0000FF'))
+            if self.modify_bits and self.modify_bits[step][frame] == 1:
+                artists.append(ax.text(step - 0.3, frame - 0.3, "M", ha='center', va='center',
+                                       fontsize=7, color='#E65100', fontweight='bold'))
+        return artists
+
+
+class DiskPlayback(_Playback):
+
+    def __init__(self, canvas, results, head_start, cylinders):
+        super().__init__(canvas, len(results['sequence']))
+        stats = ds_series(results, head_start)
+        # Each step draws the head's path to the next request, through any sweep turnaround
+        self.path = [head_start] + stats['head_path'].tolist()
+        self.bounds = [0] + (stats['stops'] + 1).tolist()
+        self.running_total = stats['running_total']
+
+        self.figure.clear()
+        ax = self.ax = self.figure.add_subplot(111)
+        ax.set_xlim(0, max(cylinders - 1, 1))
+        ax.set_ylim(self.steps + 0.5, -0.5)
+        ax.set_xlabel("Cylinder", fontsize=12)
+        ax.set_ylabel("Request", fontsize=12)
+        ax.xaxis.set_label_position('top')
+        ax.xaxis.tick_top()
+        ax.spines['bottom'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.grid(True, axis='x', alpha=0.3)
+        ax.plot([head_start], [0], 'o', color='#455A64', markersize=8)
+
+        self.head = Line2D([head_start, head_start], [-0.5, self.steps + 0.5], color='orange', linewidth=2,
+                           animated=True)
+        ax.add_line(self.head)
+        self.counter = ax.text(1.0, -0.08, "", transform=ax.transAxes, ha='right', va='top',
+                               fontsize=12, fontweight='bold', animated=True)
+        self.overlay = [self.head, self.counter]
+        self.figure.subplots_adjust(left=0.08, right=0.97, top=0.88, bottom=0.1)
+
+    def _update_overlay(self):
+        cylinder = self.path[self.bounds[self.position]]
+        self.head.set_xdata([cylinder, cylinder])
+        seek = int(self.running_total[self.position - 1]) if self.position else 0
+        self.counter.set_text(f"Request {self.position}/{self.steps}   Head {cylinder}   Seek {seek}")
+
+    def _reveal(self, step):
+        x = self.path[self.bounds[step]:self.bounds[step + 1] + 1]
+        y = np.linspace(step, step + 1, len(x))
+        segment = Line2D(x, y, color='black', linewidth=1, marker='o', markersize=6, markevery=[len(x) - 1])
+        self.ax.add_line(segment)
+        return [segment]
@@ -0,0 +1,149 @@
+import itertools
+from collections import OrderedDict
+from virtual_memory import ENGINES
+
+
+class SequentialPrefetcher:
+    # Read-ahead with an adaptive window: grows while the stream stays sequential,
+    # collapses back to the initial size when it breaks
+
+    def __init__(self, initial=2, max_window=32):
+        self.initial = initial
+        self.max_window = max_window
+        self.window = initial
+        self.last = None
+
+    def observe(self, page, outcome):
+        sequential = self.last is not None and page == self.last + 1
+        self.last = page
+        if outcome == 'fault':
+            self.window = min(self.window * 2, self.max_window) if sequential else self.initial
+            return range(page + 1, page + 1 + self.window)
+        if outcome == 'prefetch_hit':
+            # The read-ahead paid off: keep the next window in flight
+            self.window = min(self.window * 2, self.max_window)
+            return range(page + 1, page + 1 + self.window)
+        return ()
+
+
+class StridePrefetcher:
+    # Prefetch degree pages ahead once the same non-zero stride is seen twice in a row
+
+    def __init__(self, degree=2):
+        self.degree = degree
+        self.last = None
+        self.stride = None
+
+    def observe(self, page, outcome):
+        stride = None if self.last is None else page - self.last
+        confirmed = stride is not None and stride != 0 and stride == self.stride
+        self.last = page
+        self.stride = stride
+        if not confirmed:
+            return ()
+        return [page + stride * k for k in range(1, self.degree + 1)]
+
+
+class MarkovPrefetcher:
+    # First-order Markov predictor: remembers the most recent successors of each page
+
+    def __init__(self, width=2, table_size=4096):
+        self.width = width
+        self.table_size = table_size
+        self.table = OrderedDict()
+        self.last = None
+
+    def observe(self, page, outcome):
+        if self.last is not None and self.last != page:
+            successors = self.table.pop(self.last, None)
+            if successors is None:
+                successors = OrderedDict()
+                if len(self.table) >= self.table_size:
+                    self.table.popitem(last=False)
+            successors.pop(page, None)
+            successors[page] = True
+            if len(successors) > self.width:
+                successors.popitem(last=False)
+            self.table[self.last] = successors
+        self.last = page
+        successors = self.table.get(page)
+        return reversed(successors) if successors else ()
+
+
+PREFETCHERS = {
+    'Sequential': SequentialPrefetcher,
+    'Stride': StridePrefetcher,
+    'Markov': MarkovPrefetcher,
+}
+
+
+def Prefetch(frames, ref_string, prefetcher, algorithm="FIFO", record=False):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if isinstance(prefetcher, str):
+        if prefetcher not in PREFETCHERS:
+            raise ValueError(f"Unknown prefetcher: {prefetcher}")
+        prefetcher = PREFETCHERS[prefetcher]()
+    engine = ENGINES[algorithm](frames)
+    baseline = ENGINES[algorithm](frames)
+    unused = set()
+    faults = 0
+    hits = 0
+    baseline_faults = 0
+    issued = 0
+    useful = 0
+    polluted = 0
+    sequence = []
+    access_type = []
+
+    def evicted():
+        nonlocal polluted
+        if engine.evicted in unused:
+            unused.discard(engine.evicted)
+            polluted += 1
+
+    for page in ref_string:
+        if not baseline.access(page):
+            baseline_faults += 1
+        if engine.access(page):
+            hits += 1
+            access_type.append(True)  # Hit
+            if page in unused:
+                unused.discard(page)
+                useful += 1
+                outcome = 'prefetch_hit'
+            else:
+                outcome = 'hit'
+        else:
+            faults += 1
+            access_type.append(False)  # Fault
+            evicted()
+            outcome = 'fault'
+
+        # Cap each burst at half the frames so read-ahead cannot flush the whole working set
+        for predicted in itertools.islice(prefetcher.observe(page, outcome), max(1, frames // 2)):
+            if predicted < 0 or predicted == page:
+                continue
+            if engine.prefetch(predicted):
+                issued += 1
+                evicted()
+                unused.add(predicted)
+
+        if record:
+            sequence.append(engine.page_frames.copy())
+
+    return {
+        'faults': faults,
+        'hits': hits,
+        'sequence': sequence,
+        'access_type': access_type,
+        'ref_string': ref_string,
+        'baseline_faults': baseline_faults,
+        'faults_removed': baseline_faults - faults,
+        'prefetches': issued,
+        'useful_prefetches': useful,
+        'polluting_prefetches': polluted,
+        'accuracy': useful / issued if issued else 0.0,
+        'coverage': useful / (useful + faults) if useful + faults else 0.0,
+        'pollution': polluted / issued if issued else 0.0,
+    }
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from disk_model import DiskModel
+from disk_scheduling import SCAN, LOOK
+
+
+def stripe_map(blocks, disks, level=0, stripe_blocks=16, writes=None):
+    # Map logical blocks to (disk, disk_block) pairs; one logical request may become several I/Os
+    blocks = np.asarray(blocks, dtype=np.int64)
+    writes = np.zeros(blocks.shape, dtype=bool) if writes is None else np.asarray(writes, dtype=bool)
+    if (blocks < 0).any():
+        raise ValueError("Logical blocks must be non-negative")
+    offset = blocks % stripe_blocks
+    stripe = blocks // stripe_blocks
+
+    if level == 0:
+        if disks < 1:
+            raise ValueError("RAID-0 needs at least 1 disk")
+        disk = stripe % disks
+        disk_block = (stripe // disks) * stripe_blocks + offset
+        return disk, disk_block
+
+    if level == 1:
+        if disks < 2:
+            raise ValueError("RAID-1 needs at least 2 disks")
+        # Reads alternate between mirrors, writes go to every mirror
+        read_disk = stripe[~writes] % disks
+        read_block = blocks[~writes]
+        write_block = np.repeat(blocks[writes], disks)
+        write_disk = np.tile(np.arange(disks), int(writes.sum()))
+        return np.concatenate((read_disk, write_disk)), np.concatenate((read_block, write_block))
+
+    if level == 5:
+        if disks < 3:
+            raise ValueError("RAID-5 needs at least 3 disks")
+        # Left-symmetric layout: parity rotates backwards, data starts right after it
+        row = stripe // (disks - 1)
+        parity = (disks - 1) - row % disks
+        disk = (parity + 1 + stripe % (disks - 1)) % disks
+        disk_block = row * stripe_blocks + offset
+        # Small writes are read-modify-write: old data and parity are read, then both rewritten
+        data_disk = np.concatenate((disk[~writes], np.repeat(disk[writes], 2), np.repeat(parity[writes], 2)))
+        data_block = np.concatenate((disk_block[~writes], np.repeat(disk_block[writes], 2),
+                                     np.repeat(disk_block[writes], 2)))
+        return data_disk, data_block
+
+    raise ValueError("RAID level must be 0, 1 or 5")
+
+
+def _schedule_disk(args):
+    queue, head_start, disk_size, algorithm, direction, model = args
+    if not queue:
+        return {'sequence': [], 'seek_distance': 0, 'requests': 0, 'busy_time': 0.0}
+    if algorithm == "SCAN":
+        results = SCAN(list(queue), head_start, disk_size, direction, model)  # SCAN appends to its argument
+    else:
+        results = LOOK(queue, head_start, direction, model)
+    results['requests'] = len(queue)
+    results['busy_time'] = results['total_service_time']
+    del results['service_times']
+    return results
+
+
+def RAID(blocks, disks, disk_size, level=0, stripe_blocks=16, blocks_per_cylinder=64,
+         head_start=0, algorithm="SCAN", direction="right", writes=None, model=None, workers=None):
+    if algorithm not in ("SCAN", "LOOK"):
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if model is None:
+        model = DiskModel.from_profile('desktop_7200', disk_size)
+
+    disk, disk_block = stripe_map(blocks, disks, level, stripe_blocks, writes)
+    cylinder = disk_block // blocks_per_cylinder
+    if cylinder.size and cylinder.max() >= disk_size:
+        raise ValueError("Logical blocks exceed the capacity of the array")
+
+    # Group physical requests by disk with one stable sort instead of N boolean masks
+    order = np.argsort(disk, kind='stable')
+    bounds = np.searchsorted(disk[order], np.arange(disks + 1))
+    cylinder = cylinder[order]
+    tasks = [(cylinder[bounds[d]:bounds[d + 1]].tolist(), head_start, disk_size, algorithm, direction, model)
+             for d in range(disks)]
+
+    workers = min(disks, os.cpu_count() or 1) if workers is None else workers
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            per_disk = list(pool.map(_schedule_disk, tasks))
+    else:
+        per_disk = [_schedule_disk(task) for task in tasks]
+
+    busy = np.array([r['busy_time'] for r in per_disk])
+    makespan = float(busy.max()) if busy.size else 0.0
+    for r in per_disk:
+        r['utilization'] = r['busy_time'] / makespan if makespan > 0 else 0.0
+
+    return {
+        'disks': per_disk,
+        'logical_requests': len(blocks),
+        'physical_requests': int(len(disk)),
+        'makespan': makespan,
+        'iops': len(blocks) / (makespan / 1000) if makespan > 0 else 0.0,
+        'imbalance': float(busy.max() / busy.mean()) if busy.mean() > 0 else 1.0,
+    }
@@ -0,0 +1,323 @@
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from matplotlib.figure import Figure
+from matplotlib.collections import LineCollection
+from matplotlib.patches import Rectangle
+import numpy as np
+from trace_stats import vm_series, ds_series, downsample_path
+
+
+# Renderers draw onto a bare Figure, so the same code serves the Qt canvases in main.py
+# and offscreen Agg/SVG output for reports
+
+
+def render_vm_grid(fig, results):
+    gs = fig.add_gridspec(5, 1)
+    ax1 = fig.add_subplot(gs[0:4, 0])
+    sequence = results['sequence']
+    frames = len(sequence[0])
+    steps = len(sequence)
+    access_type = results['access_type']
+    ref_string = results['ref_string']
+
+    is_second_chance = 'reference_bits' in results
+    ref_bits = results.get('reference_bits', None)
+    modify_bits = results.get('modify_bits', None)
+
+    ax1.set_xlim(-1, steps)
+    ax1.set_ylim(frames - 0.5, -2.2 if is_second_chance else -1.8)
+
+    ax1.spines['top'].set_visible(False)
+    ax1.spines['right'].set_visible(False)
+    ax1.spines['bottom'].set_visible(True)
+    ax1.spines['left'].set_visible(False)
+    ax1.set_xticks([])
+    ax1.set_yticks([])
+
+    for i in range(steps):
+        color = '#117711' if access_type[i] else '#990000'
+        indicator = 'H' if access_type[i] else 'F'
+        ax1.text(i, -1.2, indicator, ha='center', va='center',
+                 fontsize=12, color=color, fontweight='bold')
+
+        ref_value = ref_string[i] if i < len(ref_string) else sequence[i][-1]
+        if results.get('writes') and results['writes'][i]:
+            ref_value = f"{ref_value}w"
+        ax1.text(i, -0.8, str(ref_value), ha='center', va='center',
+                 fontsize=12, fontweight='bold')
+
+    for step in range(steps):
+        for frame in range(frames):
+            page = sequence[step][frame]
+            if page is not None:
+                color = '#AAFFAA' if access_type[step] else '#FFAAAA'
+                rect = Rectangle((step - 0.4, frame - 0.4), 0.8, 0.8,
+                                 fill=True, facecolor=color,
+                                 edgecolor='black', alpha=0.7)
+                ax1.add_patch(rect)
+
+                ax1.text(step, frame, str(page), ha='center', va='center',
+                         fontsize=12, fontweight='bold')
+
+                if is_second_chance and ref_bits and ref_bits[step][frame] == 1:
+                    ax1.text(step + 0.3, frame - 0.3, "★", ha='center', va='center',
+                             fontsize=8, color='#0000FF')
+
+                if modify_bits and modify_bits[step][frame] == 1:
+                    ax1.text(step - 0.3, frame - 0.3, "M", ha='center', va='center',
+                             fontsize=7, color='#E65100', fontweight='bold')
+
+            rect = Rectangle((step - 0.5, frame - 0.5), 1, 1,
+                             fill=False, edgecolor='black', linewidth=0.5)
+            ax1.add_patch(rect)
+
+    ax1.text(-0.8, -0.8, "Ref:", ha='right', va='center', fontsize=12, fontweight='bold')
+    ax1.text(-0.8, -1.2, "Status:", ha='right', va='center', fontsize=12, fontweight='bold')
+
+    ax2 = fig.add_subplot(gs[4, 0])
+    ax2.axis('off')
+
+    legend_x = 0.2
+    ax2.add_patch(Rectangle((legend_x, 0.5), 0.1, 0.3, facecolor='#AAFFAA', alpha=0.7))
+    ax2.text(legend_x + 0.15, 0.65, "Hit", va='center', fontsize=12)
+
+    ax2.add_patch(Rectangle((legend_x + 0.3, 0.5), 0.1, 0.3, facecolor='#FFAAAA', alpha=0.7))
+    ax2.text(legend_x + 0.45, 0.65, "Fault", va='center', fontsize=12)
+
+    if is_second_chance:
+        ax2.text(legend_x + 0.7, 0.65, "★ = Second Chance (Ref bit = 1)", va='center', fontsize=12, color='#0000FF')
+    if modify_bits:
+        ax2.text(legend_x + 0.7, 0.25, "M = Modified (dirty)", va='center', fontsize=12, color='#E65100')
+
+    ax1.set_aspect('equal')
+    fig.subplots_adjust(left=0.1, right=0.9, top=0.95, bottom=0.1, hspace=0.2)
+
+
+def render_ws_series(fig, results, frames):
+    ax = fig.add_subplot(111)
+    ws_size = results['ws_size']
+    ax.step(range(len(ws_size)), ws_size, where='mid', color='#1565C0', linewidth=2, label="Working set size")
+    ax.axhline(frames, color='#990000', linestyle='--', linewidth=1, label=f"Frames = {frames}")
+
+    ax.set_xlabel("Step", fontsize=11)
+    ax.set_ylabel("Pages", fontsize=11)
+    ax.set_xlim(-0.5, len(ws_size) - 0.5)
+    ax.set_ylim(0, max(max(ws_size), frames) + 1)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='upper right')
+
+    fig.tight_layout()
+
+
+def render_vm_stats(fig, results):
+    stats = vm_series(results)
+    ax1 = fig.add_subplot(131)
+    ax1.plot(range(len(stats['fault_rate'])), stats['fault_rate'], color='#990000', linewidth=2)
+    ax1.set_title(f"Fault Rate (window {stats['window']})", fontsize=11)
+    ax1.set_xlabel("Step", fontsize=10)
+    ax1.set_ylim(0, 1.05)
+
+    ax2 = fig.add_subplot(132)
+    histogram = stats['inter_fault_histogram']
+    if len(histogram) <= 200:
+        ax2.bar(range(len(histogram)), histogram, color='#E65100', width=0.8)
+    else:
+        ax2.stairs(histogram, np.arange(len(histogram) + 1) - 0.5, color='#E65100', fill=True)
+    ax2.set_title("Inter-Fault Distance", fontsize=11)
+    ax2.set_xlabel("References between faults", fontsize=10)
+
+    ax3 = fig.add_subplot(133)
+    histogram = stats['reuse_histogram']
+    if len(histogram) <= 200:
+        ax3.bar(range(len(histogram)), histogram, color='#1565C0', width=0.8)
+    else:
+        ax3.stairs(histogram, np.arange(len(histogram) + 1) - 0.5, color='#1565C0', fill=True)
+    ax3.set_title("Reuse Distance", fontsize=11)
+    ax3.set_xlabel("Distinct pages since previous use", fontsize=10)
+
+    for ax in (ax1, ax2, ax3):
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.grid(True, alpha=0.3)
+
+    fig.tight_layout()
+
+
+def render_vm_mrc(fig, results):
+    ax = fig.add_subplot(111)
+    frames = np.array(results['frames'])
+    miss_ratio = np.array(results['miss_ratio'])
+    error_bound = np.array(results['error_bound'])
+
+    ax.fill_between(frames, np.clip(miss_ratio - error_bound, 0, 1), np.clip(miss_ratio + error_bound, 0, 1),
+                    color='#80CBC4', alpha=0.5, label='Error bound (sampling + cache scaling)')
+    ax.plot(frames, miss_ratio, 'o-', color='#00695C', linewidth=2, markersize=4, label='Miss ratio')
+
+    ax.set_xlabel("Frames", fontsize=12)
+    ax.set_ylabel("Miss Ratio", fontsize=12)
+    ax.set_ylim(0, 1.05)
+    ax.set_title(f"{results['algorithm']} Miss-Ratio Curve (sampling rate {results['sample_rate']})", fontsize=13)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    fig.tight_layout()
+
+
+def render_ds_path(fig, results, head_start, cylinders):
+    ax = fig.add_subplot(111)
+
+    # x is the real cylinder number, y the order of service, starting at the head position;
+    # a sweep turnaround sits between the requests either side of it
+    stats = ds_series(results, head_start)
+    x = np.concatenate(([head_start], stats['head_path']))
+    served = np.concatenate(([0], stats['stops'] + 1))
+    y = np.interp(np.arange(len(x)), served, np.arange(len(served)))
+    keep = downsample_path(x, max_points=2 * int(fig.get_figwidth() * fig.dpi))
+    points = np.column_stack((x[keep], y[keep]))
+    ax.add_collection(LineCollection([points], colors='black', linewidths=1))
+
+    if len(served) <= 201:
+        ax.plot(x[served[1:]], y[served[1:]], 'ko', markersize=8)
+    ax.plot(x[:1], y[:1], 'o', color='orange', markersize=9)
+
+    requested = np.unique(x[served[1:]])
+    if len(requested) <= 30:
+        top = ax.secondary_xaxis('top')
+        top.set_xticks(requested)
+        top.tick_params(colors='orange', labelsize=10, length=0)
+        top.spines['top'].set_visible(False)
+
+    ax.set_xlim(-0.01 * cylinders, (cylinders - 1) * 1.01)
+    ax.set_ylim(y[-1] + max(0.5, 0.02 * y[-1]), -max(0.5, 0.02 * y[-1]))
+    ax.set_xlabel("Cylinder", fontsize=12)
+    ax.set_ylabel("Request", fontsize=12)
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, axis='x', alpha=0.3)
+
+    fig.tight_layout()
+
+
+def render_ds_stats(fig, results, head_start):
+    stats = ds_series(results, head_start)
+    ax = fig.add_subplot(111)
+    seek = stats['seek_distances']
+    total = stats['running_total']
+    requests = np.arange(1, len(seek) + 1)
+    ax_total = ax.twinx()
+    if len(seek) <= 200:
+        ax.bar(requests, seek, color='#FFB74D', width=0.8, label="Seek distance")
+        ax_total.plot(requests, total, 'o-', color='#455A64', linewidth=2, markersize=4, label="Running total")
+    else:
+        keep = downsample_path(seek)
+        ax.fill_between(requests[keep], seek[keep], step='mid', color='#FFB74D', label="Seek distance")
+        keep = downsample_path(total)
+        ax_total.plot(requests[keep], total[keep], '-', color='#455A64', linewidth=2, label="Running total")
+    ax.set_xlabel("Request", fontsize=11)
+    ax.set_ylabel("Cylinders", fontsize=11)
+
+    ax_total.set_ylabel("Total", fontsize=11)
+    ax_total.set_ylim(0, None)
+
+    ax.spines['top'].set_visible(False)
+    ax_total.spines['top'].set_visible(False)
+    ax.grid(True, alpha=0.3)
+    ax.legend(loc='upper left')
+    ax_total.legend(loc='upper right')
+
+    fig.tight_layout()
+
+
+def render_ds_sweep(fig, results, current_pos, algorithm):
+    ax = fig.add_subplot(111)
+    heads = results['heads']
+    for name in ('SCAN', 'LOOK'):
+        style = '-' if name == algorithm else ':'
+        key = name.lower()
+        ax.plot(heads, results[key + '_right'], style, color='#1565C0', linewidth=2 if name == algorithm else 1,
+                label=f"{name} (right)")
+        ax.plot(heads, results[key + '_left'], style, color='#E65100', linewidth=2 if name == algorithm else 1,
+                label=f"{name} (left)")
+    ax.axvline(current_pos, color='#455A64', linestyle='--', linewidth=1, label="Current position")
+
+    ax.set_xlabel("Initial Head Position (cylinder)", fontsize=12)
+    ax.set_ylabel("Total Seek Distance", fontsize=12)
+    ax.set_xlim(0, heads[-1])
+    ax.spines['top'].set_visible(False)
+    ax.spines['right'].set_visible(False)
+    ax.grid(True, alpha=0.3)
+    ax.legend()
+
+    fig.tight_layout()
+
+
+# name -> (renderer, figure size in inches)
+RENDERERS = {
+    'vm_grid': (render_vm_grid, (16, 10)),
+    'ws_series': (render_ws_series, (16, 3)),
+    'vm_stats': (render_vm_stats, (16, 3)),
+    'vm_mrc': (render_vm_mrc, (12, 6)),
+    'ds_path': (render_ds_path, (12, 6)),
+    'ds_stats': (render_ds_stats, (12, 3)),
+    'ds_sweep': (render_ds_sweep, (12, 6)),
+}
+
+
+def new_figure(kind):
+    if kind not in RENDERERS:
+        raise ValueError(f"Unknown plot: {kind}")
+    return Figure(figsize=RENDERERS[kind][1])
+
+
+def render_to_file(path, kind, *args):
+    # Figure.savefig picks the Agg or SVG backend from the extension, no GUI involved
+    fig = new_figure(kind)
+    RENDERERS[kind][0](fig, *args)
+    fig.savefig(path)
+    return path
+
+
+def _render_job(task):
+    directory, index, kind, args, formats = task
+    stem = f"{index:04d}_{kind}"
+    return [os.path.basename(render_to_file(os.path.join(directory, f"{stem}.{fmt}"), kind, *args))
+            for fmt in formats]
+
+
+def RenderGallery(jobs, directory, formats=('png',), workers=None, title="Simulation Report"):
+    # jobs: iterable of (caption, kind, args) tuples, rendered across a process pool
+    jobs = list(jobs)
+    formats = tuple(formats)
+    for fmt in formats:
+        if fmt not in ('png', 'svg'):
+            raise ValueError("Gallery formats must be 'png' or 'svg'")
+    for _, kind, _ in jobs:
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown plot: {kind}")
+    os.makedirs(directory, exist_ok=True)
+
+    tasks = [(directory, i, kind, tuple(args), formats) for i, (_, kind, args) in enumerate(jobs)]
+    workers = min(len(tasks), os.cpu_count() or 1) if workers is None else workers
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            files = list(pool.map(_render_job, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    else:
+        files = [_render_job(task) for task in tasks]
+
+    entries = []
+    for (caption, _, _), names in zip(jobs, files):
+        links = " ".join(f'<a href="{html.escape(name)}">{name.rsplit(".", 1)[1].upper()}</a>' for name in names)
+        entries.append(f'<figure><img src="{html.escape(names[0])}" alt="{html.escape(caption)}">'
+                       f'<figcaption>{html.escape(caption)} {links}</figcaption></figure>')
+    index = os.path.join(directory, 'index.html')
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>\n"
+                "<style>body{font-family:sans-serif;margin:2em}figure{margin:0 0 2em}"
+                "img{max-width:100%;border:1px solid #ddd}</style></head>\n"
+                f"<body><h1>{html.escape(title)}</h1>\n" + "\n".join(entries) + "\n</body></html>\n")
+    return {'index': index, 'files': [name for names in files for name in names]}
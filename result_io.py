@@ -0,0 +1,285 @@
+import json
+import struct
+import zipfile
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+_CHUNK = 1 << 16  # steps per written chunk
+_COLUMN_MIN = 16  # shorter numeric series stay in the metadata
+_META = '__meta__.json'
+
+
+def _steps(results):
+    if 'sequence' not in results:
+        raise ValueError("Results have no sequence to export")
+    return len(results['sequence'])
+
+
+def _to_array(chunk, dtype=None):
+    array = np.asarray(chunk)
+    if array.dtype == object:
+        # Empty frames are stored as -1, the same as in shared_results
+        array = np.array([[-1 if page is None else page for page in row] for row in array.tolist()]
+                         if array.ndim == 2 else [-1 if page is None else page for page in array.tolist()])
+    return array if dtype is None else array.astype(dtype, copy=False)
+
+
+def _is_column(value, steps):
+    # Numeric 1-D/2-D series become columns whatever their length (SCAN's head path is one
+    # longer than its sequence); lists of records and other small values do not
+    if not isinstance(value, (list, tuple, np.ndarray, RowView)) or len(value) == 0:
+        return False
+    if len(value) != steps and len(value) < _COLUMN_MIN:
+        return False
+    try:
+        probe = _to_array(value[:_CHUNK])
+    except (TypeError, ValueError):
+        return False
+    return probe.ndim in (1, 2) and probe.dtype.kind in 'biuf'
+
+
+def _split(results):
+    # Per-step series become columns, each with its own length; everything else is small and
+    # goes into the metadata
+    steps = _steps(results)
+    lengths = {}
+    meta = {}
+    for name, value in results.items():
+        if _is_column(value, steps):
+            lengths[name] = len(value)
+        elif isinstance(value, np.ndarray):
+            meta[name] = value.tolist()
+        elif isinstance(value, np.generic):
+            meta[name] = value.item()
+        else:
+            meta[name] = value
+    return steps, lengths, meta
+
+
+def _chunks(results, name, length):
+    # Slices are converted one at a time, so no full second copy of a column is ever built
+    dtype = None
+    for begin in range(0, length, _CHUNK):
+        array = _to_array(results[name][begin:begin + _CHUNK], dtype)
+        dtype = array.dtype
+        yield array
+
+
+def _format(path):
+    for suffix, fmt in (('.npz', 'npz'), ('.arrow', 'arrow'), ('.feather', 'arrow'), ('.parquet', 'parquet')):
+        if str(path).endswith(suffix):
+            return fmt
+    raise ValueError("Export file must end in .npz, .arrow, .feather or .parquet")
+
+
+def export_results(path, results, meta=None, compress=True):
+    fmt = _format(path)
+    steps, lengths, extra = _split(results)
+    extra.update(meta or {})
+    extra['steps'] = steps
+    extra['columns'] = list(lengths)
+    extra['lengths'] = lengths
+    try:
+        header = json.dumps(extra)
+    except TypeError as e:
+        raise ValueError(f"Result field cannot be exported: {e}")
+
+    if fmt == 'npz':
+        _export_npz(path, results, lengths, header, compress)
+    else:
+        if pa is None:
+            raise ValueError("Arrow and Parquet export need pyarrow installed")
+        _export_arrow(path, results, lengths, header, compress, fmt)
+
+
+def _export_npz(path, results, lengths, header, compress):
+    compression = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with zipfile.ZipFile(path, 'w', compression, allowZip64=True) as archive:
+        archive.writestr(_META, header)
+        for name, length in lengths.items():
+            chunks = _chunks(results, name, length)
+            first = next(chunks)
+            with archive.open(name + '.npy', 'w', force_zip64=True) as member:
+                np.lib.format.write_array_header_2_0(member, {
+                    'descr': np.lib.format.dtype_to_descr(first.dtype),
+                    'fortran_order': False,
+                    'shape': (length,) + first.shape[1:],
+                })
+                member.write(np.ascontiguousarray(first).tobytes())
+                for chunk in chunks:
+                    member.write(np.ascontiguousarray(chunk).tobytes())
+
+
+def _arrow_column(array):
+    if array.ndim == 2:
+        return pa.FixedSizeListArray.from_arrays(pa.array(array.ravel()), array.shape[1])
+    return pa.array(array)
+
+
+def _export_arrow(path, results, lengths, header, compress, fmt):
+    # A table has one row count, so shorter columns are padded with nulls; the lengths in the
+    # metadata cut them back on import
+    columns = list(lengths)
+    rows = max(lengths.values(), default=0)
+    chunked = {name: _chunks(results, name, length) for name, length in lengths.items()}
+    types = {}
+    writer = None
+    try:
+        for begin in range(0, rows, _CHUNK):
+            size = min(_CHUNK, rows - begin)
+            arrays = []
+            for name in columns:
+                if begin < lengths[name]:
+                    array = _arrow_column(next(chunked[name]))
+                    types[name] = array.type
+                else:
+                    array = pa.nulls(0, types[name])
+                if len(array) < size:
+                    array = pa.concat_arrays([array, pa.nulls(size - len(array), types[name])])
+                arrays.append(array)
+            batch = pa.record_batch(arrays, names=columns)
+            if writer is None:
+                schema = batch.schema.with_metadata({'results': header})
+                if fmt == 'parquet':
+                    writer = pq.ParquetWriter(path, schema, compression='zstd' if compress else 'none')
+                else:
+                    options = pa_ipc.IpcWriteOptions(compression='zstd' if compress else None)
+                    writer = pa_ipc.new_file(path, schema, options=options)
+            if fmt == 'parquet':
+                writer.write_table(pa.Table.from_batches([batch], schema))
+            else:
+                writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def load_results(path):
+    # Uncompressed npz members and uncompressed Arrow files are memory-mapped, so reloading
+    # a large run costs nothing until the data is touched
+    fmt = _format(path)
+    if fmt == 'npz':
+        return _load_npz(path)
+    if pa is None:
+        raise ValueError("Arrow and Parquet import need pyarrow installed")
+    return _load_arrow(path, fmt)
+
+
+def _load_npz(path):
+    results = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as raw:
+        meta = json.loads(archive.read(_META))
+        for info in archive.infolist():
+            if info.filename == _META:
+                continue
+            name = info.filename[:-len('.npy')]
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    results[name] = np.lib.format.read_array(member)
+                continue
+            # Skip the member's local header to reach the .npy bytes, then map past the array header
+            raw.seek(info.header_offset)
+            local = raw.read(30)
+            name_length, extra_length = struct.unpack('<HH', local[26:30])
+            raw.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(raw)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(raw)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(raw)
+            results[name] = np.memmap(path, dtype=dtype, mode='r', offset=raw.tell(), shape=shape,
+                                      order='F' if fortran else 'C')
+    return _merge(results, meta)
+
+
+def _load_arrow(path, fmt):
+    if fmt == 'parquet':
+        table = pq.read_table(path, memory_map=True)
+    else:
+        table = pa_ipc.open_file(pa.memory_map(path)).read_all()
+    meta = json.loads(table.schema.metadata[b'results'])
+    lengths = meta.get('lengths', {})
+    results = {}
+    for name in table.column_names:
+        column = table.column(name)
+        if name in lengths:
+            column = column.slice(0, lengths[name])
+        if pa.types.is_fixed_size_list(column.type):
+            width = column.type.list_size
+            values = [chunk.flatten().to_numpy(zero_copy_only=False) for chunk in column.chunks]
+            results[name] = np.concatenate(values).reshape(-1, width)
+        else:
+            results[name] = column.to_numpy()
+    return _merge(results, meta)
+
+
+def _merge(columns, meta):
+    results = {key: value for key, value in meta.items() if key not in ('steps', 'columns', 'lengths')}
+    results.update(columns)
+    return results
+
+
+class RowView:
+    # Read-only list view of a stored column: a row becomes Python values only when it is
+    # indexed, so a memory-mapped column stays on disk until something draws it. NumPy code
+    # gets the mapped array itself.
+
+    def __init__(self, array, empty=None):
+        self.array = array
+        self.empty = empty  # stored value of an empty frame, shown as None
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RowView(self.array[index], self.empty)
+        return self._expand(self.array[index].tolist())
+
+    def __iter__(self):
+        for begin in range(0, len(self.array), _CHUNK):
+            for row in self.array[begin:begin + _CHUNK].tolist():
+                yield self._expand(row)
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.array, dtype=dtype)
+
+    def _expand(self, row):
+        if self.empty is not None and isinstance(row, list):
+            return [None if page == self.empty else page for page in row]
+        return row
+
+
+def as_views(results):
+    # Wrap a reloaded result's columns in RowViews instead of copying them into lists
+    viewed = dict(results)
+    for name, value in results.items():
+        if isinstance(value, np.ndarray):
+            viewed[name] = RowView(value, -1 if name == 'sequence' and value.ndim == 2 else None)
+    return viewed
+
+
+def first_steps(results, count):
+    # The same result cut to its first count steps, for views that can only draw a few
+    steps = _steps(results)
+    if steps <= count:
+        return results
+    return {name: value[:count] if isinstance(value, (list, tuple, np.ndarray, RowView)) and len(value) == steps
+            else value for name, value in results.items()}
+
+
+def to_lists(results):
+    # Copy a reloaded result into the list form the plots expect; only for small runs
+    converted = dict(results)
+    for name, value in results.items():
+        if isinstance(value, np.ndarray):
+            converted[name] = value.tolist()
+    if 'sequence' in converted and np.ndim(results['sequence']) == 2:
+        converted['sequence'] = [[None if page < 0 else page for page in row] for row in converted['sequence']]
+    return converted
@@ -0,0 +1,148 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+import numpy as np
+from virtual_memory import ENGINES
+
+
+def _create(blocks, layout, name, shape, dtype):
+    dtype = np.dtype(dtype)
+    block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * dtype.itemsize))
+    blocks.append(block)
+    layout[name] = (block.name, shape, dtype.str)
+    return np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _simulate_into_shared(args):
+    # Runs in the worker: the history is written straight into shared memory and only the
+    # block names go back through the pipe
+    algorithm, frames, pages, writes = args
+    engine = ENGINES[algorithm](frames)
+    steps = len(pages)
+    blocks = []
+    layout = {}
+    try:
+        sequence = _create(blocks, layout, 'sequence', (steps, frames), np.int64)
+        access_type = _create(blocks, layout, 'access_type', (steps,), np.bool_)
+        reference_bits = None
+        modify_bits = None
+        if hasattr(engine, 'reference_bits'):
+            reference_bits = _create(blocks, layout, 'reference_bits', (steps, frames), np.uint8)
+        if hasattr(engine, 'modify_bits'):
+            modify_bits = _create(blocks, layout, 'modify_bits', (steps, frames), np.uint8)
+
+        row = np.full(frames, -1, dtype=np.int64)  # -1 marks an empty frame
+        flags = np.zeros(steps, dtype=bool) if writes is None else writes
+        for t, (page, write) in enumerate(zip(pages.tolist(), flags.tolist())):
+            hit = engine.access(page, write)
+            access_type[t] = hit
+            if not hit:
+                row[engine.slot_of[page]] = page
+            sequence[t] = row
+            if reference_bits is not None:
+                reference_bits[t] = engine.reference_bits
+            if modify_bits is not None:
+                modify_bits[t] = engine.modify_bits
+        faults = steps - int(access_type.sum())
+    except BaseException:
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+
+    # Drop the worker's mappings; the parent owns the blocks from here on
+    del sequence, access_type, reference_bits, modify_bits
+    for block in blocks:
+        block.close()
+    return layout, faults
+
+
+class SharedResult:
+    # Parent-side view of a worker's history; the arrays map the shared blocks without copying
+    # and stay valid until close(), which also frees the blocks
+
+    def __init__(self, layout, faults, algorithm, ref_string):
+        self.algorithm = algorithm
+        self.ref_string = ref_string
+        self.faults = faults
+        self.hits = len(ref_string) - faults
+        self.arrays = {}
+        self._blocks = []
+        try:
+            for name, (block_name, shape, dtype) in layout.items():
+                block = shared_memory.SharedMemory(name=block_name)
+                self._blocks.append(block)
+                self.arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        except BaseException:
+            self.arrays.clear()
+            for block in self._blocks:
+                block.close()
+            # Unlink every block the worker made, mapped or not
+            for block_name, _, _ in layout.values():
+                try:
+                    shared_memory.SharedMemory(name=block_name).unlink()
+                except FileNotFoundError:
+                    pass
+            raise
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def __contains__(self, name):
+        return name in self.arrays
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Views must go before the buffers they point into can be released
+        self.arrays.clear()
+        blocks, self._blocks = self._blocks, []
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    def to_results(self):
+        # Copy into the list-based format the plotting code expects; only for small runs
+        sequence = [[None if page < 0 else page for page in row] for row in self.arrays['sequence'].tolist()]
+        results = {
+            'faults': self.faults,
+            'hits': self.hits,
+            'sequence': sequence,
+            'access_type': self.arrays['access_type'].tolist(),
+            'ref_string': list(self.ref_string),
+        }
+        if 'reference_bits' in self.arrays:
+            results['reference_bits'] = self.arrays['reference_bits'].tolist()
+        if 'modify_bits' in self.arrays:
+            results['modify_bits'] = self.arrays['modify_bits'].tolist()
+        return results
+
+
+def SimulateShared(frames, ref_string, algorithm="FIFO", writes=None, executor=None):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if frames <= 0:
+        raise ValueError("Number of frames must be positive")
+    pages = np.asarray(ref_string, dtype=np.int64)
+    if pages.ndim != 1 or len(pages) == 0:
+        raise ValueError("Reference string cannot be empty")
+    if (pages < 0).any():
+        raise ValueError("Page numbers must be non-negative")
+    if writes is not None:
+        writes = np.asarray(writes, dtype=bool)
+        if len(writes) != len(pages):
+            raise ValueError("Write flags must match the reference string")
+
+    # Workers must share the parent's resource tracker, otherwise a worker's own tracker
+    # would unlink the blocks when it exits
+    resource_tracker.ensure_running()
+    task = (algorithm, frames, pages, writes)
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            layout, faults = pool.submit(_simulate_into_shared, task).result()
+    else:
+        layout, faults = executor.submit(_simulate_into_shared, task).result()
+    return SharedResult(layout, faults, algorithm, ref_string)
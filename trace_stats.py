@@ -0,0 +1,108 @@
+import numpy as np
+
+
+def default_window(steps):
+    return max(1, min(1000, steps // 10))
+
+
+def reuse_distances(ref_string):
+    # LRU stack distance of every re-reference: the distinct other pages used since the page's
+    # previous use. A Fenwick tree over positions holds a mark at each page's latest use, so
+    # the distance is the number of marks strictly between the two uses; first touches have none.
+    pages = np.asarray(ref_string)
+    n = len(pages)
+    order = np.argsort(pages, kind='stable')
+    same = pages[order[1:]] == pages[order[:-1]]
+    previous = np.full(n, -1, dtype=np.int64)
+    previous[order[1:][same]] = order[:-1][same]
+
+    tree = [0] * (n + 1)
+    distances = []
+    for i, p in enumerate(previous.tolist()):
+        if p >= 0:
+            # marks at positions p+1 .. i-1
+            count = 0
+            k = i
+            while k > 0:
+                count += tree[k]
+                k &= k - 1
+            k = p + 1
+            while k > 0:
+                count -= tree[k]
+                k &= k - 1
+            distances.append(count)
+            k = p + 1
+            while k <= n:
+                tree[k] -= 1
+                k += k & -k
+        k = i + 1
+        while k <= n:
+            tree[k] += 1
+            k += k & -k
+    return np.array(distances, dtype=np.int64)
+
+
+def vm_series(results, window=None):
+    hits = np.asarray(results['access_type'], dtype=bool)
+    steps = len(hits)
+    window = default_window(steps) if window is None else window
+    if window <= 0:
+        raise ValueError("Window size must be positive")
+
+    # Trailing-window fault rate from one cumulative sum; the first steps use the refs seen so far
+    faults = np.concatenate(([0], np.cumsum(~hits)))
+    t = np.arange(1, steps + 1)
+    start = np.maximum(0, t - window)
+    fault_rate = (faults[t] - faults[start]) / (t - start)
+
+    fault_steps = np.flatnonzero(~hits)
+    inter_fault = np.diff(fault_steps)
+
+    reuse = reuse_distances(results['ref_string'][:steps])
+
+    return {
+        'window': window,
+        'fault_rate': fault_rate,
+        'inter_fault_distances': inter_fault,
+        'inter_fault_histogram': np.bincount(inter_fault) if inter_fault.size else np.zeros(0, dtype=np.int64),
+        'reuse_distances': reuse,
+        'reuse_histogram': np.bincount(reuse) if reuse.size else np.zeros(0, dtype=np.int64),
+    }
+
+
+def ds_series(results, head_start):
+    # Distances follow the head's real path, so SCAN's turnaround at cylinder 0 is counted
+    # in the seek of the request after it, and the total matches the scheduler's seek distance
+    sequence = np.asarray(results['sequence'], dtype=np.int64)
+    path = np.asarray(results.get('head_path', sequence), dtype=np.int64)
+    # Path stops that are sequence entries: the path only adds turnarounds, and a turnaround
+    # never sits on the cylinder of the request that follows it
+    stops = np.arange(len(path))
+    for _ in range(len(path) - len(sequence)):
+        differ = np.flatnonzero(path[stops[:len(sequence)]] != sequence)
+        stops = np.delete(stops, differ[0] if differ.size else len(sequence))
+    travelled = np.cumsum(np.abs(np.diff(path, prepend=head_start)))
+    running_total = travelled[stops]
+    return {
+        'seek_distances': np.diff(running_total, prepend=0),
+        'running_total': running_total,
+        'head_path': path,
+        'stops': stops,
+    }
+
+
+def downsample_path(values, max_points=4000):
+    # Indices to keep when a long path has more points than the screen has pixels: each bucket
+    # keeps its lowest and highest point in order, so every sweep turnaround survives
+    count = len(values)
+    if count <= max_points:
+        return np.arange(count)
+    size = -(-count // (max_points // 2))
+    whole = (count // size) * size
+    buckets = np.asarray(values[:whole]).reshape(-1, size)
+    offsets = np.arange(0, whole, size)
+    keep = [offsets + buckets.argmin(axis=1), offsets + buckets.argmax(axis=1), [0, count - 1]]
+    if whole < count:
+        tail = np.asarray(values[whole:])
+        keep.append([whole + tail.argmin(), whole + tail.argmax()])
+    return np.unique(np.concatenate(keep))
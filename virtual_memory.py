@@ -1,3 +1,8 @@
+import heapq
+import itertools
+import numpy as np
+
+
 def FIFO(frames, ref_string):
    
     page_frames = [None] * frames
@@ -90,4 +95,580 @@ def SecondChance(frames, ref_string):
         'reference_bits': ref_bit_history,
         'access_type': access_type,
         'ref_string': ref_string
-    } 
\ No newline at end of file
+    } 
+
+def EnhancedSecondChance(frames, ref_string, writes=None, read_cost=1.0, write_cost=1.0,
+                         daemon_interval=None, daemon_batch=1):
+    engine = EnhancedSecondChanceEngine(frames)
+    writes = [False] * len(ref_string) if writes is None else writes
+    if len(writes) != len(ref_string):
+        raise ValueError("Write flags must match the reference string")
+    faults = 0
+    hits = 0
+    clean_evictions = 0
+    dirty_evictions = 0
+    async_write_backs = 0
+    sequence = []
+    ref_bit_history = []
+    modify_bit_history = []
+    access_type = []
+
+    for step, (page, write) in enumerate(zip(ref_string, writes)):
+        if engine.access(page, write):
+            hits += 1
+            access_type.append(True)  # Hit
+        else:
+            faults += 1
+            access_type.append(False)  # Fault
+            if engine.evicted is not None:
+                if engine.evicted_dirty:
+                    dirty_evictions += 1
+                else:
+                    clean_evictions += 1
+        if daemon_interval and (step + 1) % daemon_interval == 0:
+            async_write_backs += engine.clean_pages(daemon_batch)
+
+        # Record the current state
+        sequence.append(engine.page_frames.copy())
+        ref_bit_history.append(engine.reference_bits.copy())
+        modify_bit_history.append(engine.modify_bits.copy())
+
+    # Dirty evictions stall the fault on a write-back; daemon writes happen off the fault path
+    fault_path_cost = faults * read_cost + dirty_evictions * write_cost
+    return {
+        'faults': faults,
+        'hits': hits,
+        'sequence': sequence,
+        'reference_bits': ref_bit_history,
+        'modify_bits': modify_bit_history,
+        'access_type': access_type,
+        'ref_string': ref_string,
+        'writes': list(writes),
+        'clean_evictions': clean_evictions,
+        'dirty_evictions': dirty_evictions,
+        'async_write_backs': async_write_backs,
+        'fault_path_cost': fault_path_cost,
+        'io_cost': fault_path_cost + async_write_backs * write_cost,
+    }
+
+
+def working_set_sizes(ref_string, tau):
+    # |W(t, tau)| for every t: reference i stays in the window until the page is referenced
+    # again or tau steps pass, so each reference adds +1 over [i, min(next_use, i + tau))
+    pages = np.asarray(ref_string)
+    n = len(pages)
+    order = np.argsort(pages, kind='stable')
+    next_use = np.full(n, n, dtype=np.int64)
+    same = pages[order[1:]] == pages[order[:-1]]
+    next_use[order[:-1][same]] = order[1:][same]
+    end = np.minimum(next_use, np.arange(n) + tau)
+    delta = np.zeros(n + 1, dtype=np.int64)
+    delta[:n] += 1
+    np.subtract.at(delta, end, 1)
+    return np.cumsum(delta[:n])
+
+
+def WorkingSet(ref_string, tau):
+    if tau <= 0:
+        raise ValueError("Window size must be positive")
+    last_use = {}
+    slot_of = {}
+    slots = []
+    free_slots = []
+    faults = 0
+    hits = 0
+    sequence = []
+    access_type = []
+    ws_size = []
+
+    for t, page in enumerate(ref_string):
+        if page in slot_of:
+            hits += 1
+            access_type.append(True)  # Hit
+        else:
+            faults += 1
+            access_type.append(False)  # Fault
+            if free_slots:
+                slot = heapq.heappop(free_slots)
+            else:
+                slot = len(slots)
+                slots.append(None)
+            slots[slot] = page
+            slot_of[page] = slot
+        last_use[page] = t
+
+        # The reference at t - tau leaves the window; its page goes unless used since
+        old = t - tau
+        if old >= 0:
+            gone = ref_string[old]
+            if last_use.get(gone) == old:
+                slot = slot_of.pop(gone)
+                slots[slot] = None
+                heapq.heappush(free_slots, slot)
+                del last_use[gone]
+
+        # Record the current state
+        sequence.append(slots.copy())
+        ws_size.append(len(slot_of))
+
+    width = len(slots)
+    return {
+        'faults': faults,
+        'hits': hits,
+        'sequence': [step + [None] * (width - len(step)) for step in sequence],
+        'access_type': access_type,
+        'ref_string': ref_string,
+        'ws_size': ws_size,
+    }
+
+
+def WSClock(frames, ref_string, tau, writes=None):
+    if tau <= 0:
+        raise ValueError("Window size must be positive")
+    writes = [False] * len(ref_string) if writes is None else writes
+    if len(writes) != len(ref_string):
+        raise ValueError("Write flags must match the reference string")
+    page_frames = [None] * frames
+    reference_bits = [0] * frames
+    modify_bits = [0] * frames
+    last_use = [0] * frames
+    slot_of = {}
+    hand = 0
+    faults = 0
+    hits = 0
+    write_backs = 0
+    sequence = []
+    ref_bit_history = []
+    access_type = []
+
+    for t, (page, write) in enumerate(zip(ref_string, writes)):
+        slot = slot_of.get(page)
+        if slot is not None:
+            hits += 1
+            access_type.append(True)  # Hit
+            reference_bits[slot] = 1
+            modify_bits[slot] |= write
+        else:
+            faults += 1
+            access_type.append(False)  # Fault
+            if len(slot_of) < frames:
+                slot = len(slot_of)
+            else:
+                slot = None
+                scheduled = 0
+                for scanned in range(1, 2 * frames + 1):
+                    if reference_bits[hand] == 1:
+                        # Referenced since the last sweep: stamp it and move on
+                        reference_bits[hand] = 0
+                        last_use[hand] = t
+                    elif t - last_use[hand] > tau:
+                        if modify_bits[hand] == 0:
+                            slot = hand
+                            break
+                        # Old but dirty: schedule the write-back and keep looking
+                        modify_bits[hand] = 0
+                        write_backs += 1
+                        scheduled += 1
+                    hand = (hand + 1) % frames
+                    if scanned == frames and scheduled == 0:
+                        # Whole clock is in the working set: take the page the sweep started at
+                        slot = hand
+                        break
+                if modify_bits[slot]:
+                    write_backs += 1
+                del slot_of[page_frames[slot]]
+                hand = (slot + 1) % frames
+            page_frames[slot] = page
+            reference_bits[slot] = 1
+            modify_bits[slot] = int(write)
+            last_use[slot] = t
+            slot_of[page] = slot
+        # Record the current state
+        sequence.append(page_frames.copy())
+        ref_bit_history.append(reference_bits.copy())
+
+    return {
+        'faults': faults,
+        'hits': hits,
+        'sequence': sequence,
+        'reference_bits': ref_bit_history,
+        'access_type': access_type,
+        'ref_string': ref_string,
+        'write_backs': write_backs,
+        'ws_size': working_set_sizes(ref_string, tau).tolist(),
+    }
+
+
+class FIFOEngine:
+    # Streaming FIFO: same replacement order as FIFO() without recording history
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.page_frames = [None] * frames
+        self.slot_of = {}
+        self.hand = 0
+        self.evicted = None
+
+    def access(self, page, write=False):
+        self.evicted = None
+        if page in self.slot_of:
+            return True
+        if len(self.slot_of) < self.frames:
+            slot = len(self.slot_of)
+        else:
+            slot = self.hand
+            self.evicted = self.page_frames[slot]
+            del self.slot_of[self.evicted]
+            self.hand = (self.hand + 1) % self.frames
+        self.page_frames[slot] = page
+        self.slot_of[page] = slot
+        return False
+
+    def prefetch(self, page):
+        if page in self.slot_of:
+            return False
+        self.access(page)
+        return True
+
+
+class SecondChanceEngine:
+    # Streaming CLOCK: the hand walks the slots in the same order as SecondChance()'s queue
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.page_frames = [None] * frames
+        self.reference_bits = [0] * frames
+        self.slot_of = {}
+        self.hand = 0
+        self.evicted = None
+
+    def access(self, page, write=False):
+        self.evicted = None
+        slot = self.slot_of.get(page)
+        if slot is not None:
+            self.reference_bits[slot] = 1
+            return True
+        if len(self.slot_of) < self.frames:
+            slot = len(self.slot_of)
+        else:
+            while self.reference_bits[self.hand] == 1:
+                # Give second chance
+                self.reference_bits[self.hand] = 0
+                self.hand = (self.hand + 1) % self.frames
+            slot = self.hand
+            self.evicted = self.page_frames[slot]
+            del self.slot_of[self.evicted]
+            self.hand = (self.hand + 1) % self.frames
+        self.page_frames[slot] = page
+        self.reference_bits[slot] = 1
+        self.slot_of[page] = slot
+        return False
+
+    def prefetch(self, page):
+        # Loaded without the reference bit, so an unused prefetch is the first to go
+        if page in self.slot_of:
+            return False
+        self.access(page)
+        self.reference_bits[self.slot_of[page]] = 0
+        return True
+
+
+class _SlotSet:
+    # Frame slots in a 64-ary bitmap tree: add, discard and next-slot lookup in O(log64 frames)
+
+    def __init__(self, size):
+        self.levels = []
+        while True:
+            words = (size + 63) // 64
+            self.levels.append([0] * words)
+            if words == 1:
+                break
+            size = words
+
+    def add(self, slot):
+        for level in self.levels:
+            word = slot >> 6
+            was = level[word]
+            level[word] = was | (1 << (slot & 63))
+            if was:
+                break
+            slot = word
+
+    def discard(self, slot):
+        for level in self.levels:
+            word = slot >> 6
+            level[word] &= ~(1 << (slot & 63))
+            if level[word]:
+                break
+            slot = word
+
+    def next_from(self, slot):
+        # Smallest member >= slot, wrapping around to the start
+        for start in (slot, 0):
+            i = start
+            for depth, level in enumerate(self.levels):
+                word = i >> 6
+                if word >= len(level):
+                    break
+                bits = level[word] >> (i & 63)
+                if bits:
+                    i += (bits & -bits).bit_length() - 1
+                    for lower in reversed(self.levels[:depth]):
+                        bits = lower[i]
+                        i = i * 64 + (bits & -bits).bit_length() - 1
+                    return i
+                i = word + 1
+        return None
+
+
+class EnhancedSecondChanceEngine:
+    # Enhanced CLOCK over (reference, modify) classes: evict the first (0,0) page ahead of the
+    # hand; failing that, sweep clearing reference bits up to the first (0,1) page; repeat.
+    # Class (0,0) and (0,1) slots are indexed so the first pass jumps instead of scanning,
+    # and the second pass only walks over bits it clears.
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.page_frames = [None] * frames
+        self.reference_bits = [0] * frames
+        self.modify_bits = [0] * frames
+        self.slot_of = {}
+        self.hand = 0
+        self.evicted = None
+        self.evicted_dirty = False
+        self.clean = _SlotSet(frames)
+        self.dirty = _SlotSet(frames)
+
+    def _set_bits(self, slot, reference, modify):
+        if self.reference_bits[slot] == 0:
+            (self.dirty if self.modify_bits[slot] else self.clean).discard(slot)
+        self.reference_bits[slot] = reference
+        self.modify_bits[slot] = modify
+        if reference == 0:
+            (self.dirty if modify else self.clean).add(slot)
+
+    def access(self, page, write=False):
+        self.evicted = None
+        self.evicted_dirty = False
+        slot = self.slot_of.get(page)
+        if slot is not None:
+            self._set_bits(slot, 1, self.modify_bits[slot] | write)
+            return True
+        if len(self.slot_of) < self.frames:
+            slot = len(self.slot_of)
+        else:
+            slot = self._victim()
+            self.evicted = self.page_frames[slot]
+            self.evicted_dirty = self.modify_bits[slot] == 1
+            del self.slot_of[self.evicted]
+            self.hand = (slot + 1) % self.frames
+        self.page_frames[slot] = page
+        self.slot_of[page] = slot
+        self._set_bits(slot, 1, int(write))
+        return False
+
+    def prefetch(self, page):
+        if page in self.slot_of:
+            return False
+        self.access(page)
+        self._set_bits(self.slot_of[page], 0, 0)
+        return True
+
+    def _victim(self):
+        while True:
+            slot = self.clean.next_from(self.hand)
+            if slot is not None:
+                return slot
+            for _ in range(self.frames):
+                if self.reference_bits[self.hand] == 0:
+                    return self.hand
+                self._set_bits(self.hand, 0, self.modify_bits[self.hand])
+                self.hand = (self.hand + 1) % self.frames
+
+    def clean_pages(self, limit):
+        # Write-back daemon: clean up to limit dirty, unreferenced pages ahead of the hand
+        cleaned = 0
+        while cleaned < limit:
+            slot = self.dirty.next_from(self.hand)
+            if slot is None:
+                break
+            self._set_bits(slot, 0, 0)
+            cleaned += 1
+        return cleaned
+
+
+ENGINES = {
+    'FIFO': FIFOEngine,
+    'SecondChance': SecondChanceEngine,
+    'EnhancedSecondChance': EnhancedSecondChanceEngine,
+}
+
+
+def compact_references(ref_string, writes=None):
+    # Run-length encode repeats of the same page. After a run's first reference the page is
+    # resident with its reference bit set, so the rest are hits in every engine and the whole
+    # run is one access, writing if any reference in it writes.
+    pages = np.asarray(ref_string, dtype=np.int64)
+    if pages.ndim != 1:
+        raise ValueError("Reference string must be one-dimensional")
+    starts = np.flatnonzero(np.concatenate(([True], pages[1:] != pages[:-1]))) if pages.size else \
+        np.zeros(0, dtype=np.int64)
+    counts = np.diff(np.append(starts, pages.size))
+    run_writes = None
+    if writes is not None:
+        writes = np.asarray(writes, dtype=bool)
+        if writes.shape != pages.shape:
+            raise ValueError("Write flags must match the reference string")
+        run_writes = np.logical_or.reduceat(writes, starts) if starts.size else np.zeros(0, dtype=bool)
+    return pages[starts], counts, run_writes
+
+
+class RunAccessTypes:
+    # Per-reference hit flags of a compacted run, expanded only when indexed: a reference is a
+    # hit unless it opens a run whose access faulted
+
+    def __init__(self, counts, run_hits):
+        self.starts = np.concatenate(([0], np.cumsum(counts)[:-1])) if len(counts) else np.zeros(0, dtype=np.int64)
+        self.run_hits = np.asarray(run_hits, dtype=bool)
+        self.length = int(np.sum(counts))
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.to_array()[index].tolist()
+        if index < 0:
+            index += self.length
+        if not 0 <= index < self.length:
+            raise IndexError("access_type index out of range")
+        run = int(np.searchsorted(self.starts, index, side='right')) - 1
+        return bool(self.run_hits[run]) if self.starts[run] == index else True
+
+    def __iter__(self):
+        return iter(self.to_array().tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        array = self.to_array()
+        return array if dtype is None else array.astype(dtype)
+
+    def count(self, value):
+        faults = int(np.count_nonzero(~self.run_hits))
+        return self.length - faults if value else faults
+
+    def to_array(self):
+        hits = np.ones(self.length, dtype=bool)
+        hits[self.starts] = self.run_hits
+        return hits
+
+
+def SimulateRuns(frames, ref_string, algorithm="FIFO", writes=None):
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    if frames <= 0:
+        raise ValueError("Number of frames must be positive")
+    pages, counts, run_writes = compact_references(ref_string, writes)
+    engine = ENGINES[algorithm](frames)
+    flags = run_writes.tolist() if run_writes is not None else [False] * len(pages)
+    run_hits = np.fromiter((engine.access(page, write) for page, write in zip(pages.tolist(), flags)),
+                           dtype=bool, count=len(pages))
+    access_type = RunAccessTypes(counts, run_hits)
+    faults = access_type.count(False)
+    return {
+        'faults': faults,
+        'hits': len(access_type) - faults,
+        'access_type': access_type,
+        'runs': len(pages),
+        'compaction': len(access_type) / len(pages) if len(pages) else 1.0,
+        'page_frames': engine.page_frames.copy(),
+        'algorithm': algorithm,
+    }
+
+
+_HASH_RANGE = 1 << 64
+_SHARDS_CHUNK = 1 << 16
+# AMS sketch of the sampled pages' reference counts, for the error bound: fixed memory
+# whatever the sampled footprint, relative error about sqrt(2 / width) per row
+_SKETCH_ROWS = 5
+_SKETCH_WIDTH = 1024
+_SKETCH_SEEDS = [(0xD1B54A32D192ED03 * (row + 1)) & (_HASH_RANGE - 1) for row in range(_SKETCH_ROWS)]
+
+
+def _spatial_hash(pages):
+    # splitmix64 finalizer, so the sample decision depends only on the page number
+    x = pages.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def SHARDS(frames, ref_string, sample_rate=0.01, algorithm="FIFO", z=1.96):
+    if not 0 < sample_rate <= 1:
+        raise ValueError("Sampling rate must be in (0, 1]")
+    if algorithm not in ENGINES:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+
+    # Cache of size C is modelled by a cache of size C * R on the sampled substream; the
+    # tolerance keeps 0.29 * 100 at 29 sampled frames rather than 28
+    largest = int(frames * sample_rate + 1e-9)
+    if largest < 1:
+        raise ValueError("Frames times the sampling rate must be at least 1 (one sampled frame)")
+    scaled_sizes = range(1, largest + 1)
+    engines = [ENGINES[algorithm](size) for size in scaled_sizes]
+    faults = [0] * len(engines)
+    threshold = np.uint64(min(int(sample_rate * _HASH_RANGE), _HASH_RANGE - 1))
+
+    total = 0
+    sampled = 0
+    sketch = np.zeros((_SKETCH_ROWS, _SKETCH_WIDTH), dtype=np.int64)
+    refs = iter(ref_string)
+    with np.errstate(over='ignore'):
+        while True:
+            chunk = np.fromiter(itertools.islice(refs, _SHARDS_CHUNK), dtype=np.int64)
+            if chunk.size == 0:
+                break
+            total += chunk.size
+            if sample_rate < 1:
+                chunk = chunk[_spatial_hash(chunk) < threshold]
+            sampled += chunk.size
+            # Repeats of a page are hits for every engine, so each run is simulated once
+            runs, counts, _ = compact_references(chunk)
+            for row, seed in enumerate(_SKETCH_SEEDS):
+                hashed = _spatial_hash(runs.astype(np.uint64) ^ np.uint64(seed))
+                signs = np.where(hashed >> np.uint64(63), counts, -counts)
+                np.add.at(sketch[row], (hashed % np.uint64(_SKETCH_WIDTH)).astype(np.int64), signs)
+            for page in runs.tolist():
+                for i, engine in enumerate(engines):
+                    if not engine.access(page):
+                        faults[i] += 1
+
+    if sampled == 0:
+        raise ValueError("No references were sampled; increase the sampling rate")
+
+    # SHARDS_adj: normalise by the expected sample count to cancel hash skew
+    expected = max(sample_rate * total, 1)
+    miss_ratio = [min(f / expected, 1.0) for f in faults]
+    # Variance of a page-sampled estimator, taking each page's misses as proportional to its references
+    sum_sq = float(np.median((sketch.astype(np.float64) ** 2).sum(axis=1)))
+    spread = np.sqrt((1 - sample_rate) * sum_sq) / expected
+    sampling_error = [float(z * m * spread) for m in miss_ratio]
+    # Shrinking the cache adds its own error, which the sampling variance does not see: a
+    # sampled cache of s frames holds only s whole pages, so its estimate is taken to be off
+    # by about 1/s relative, and by no less than its step to the neighbouring sampled sizes
+    # (a cache of no frames always misses). Unsampled runs shrink nothing and are exact.
+    steps = np.abs(np.diff([1.0] + miss_ratio))
+    neighbours = np.maximum(steps, np.append(steps[1:], 0.0))
+    scaling_error = ((1 - sample_rate) * np.maximum(neighbours, np.array(miss_ratio) / np.array(scaled_sizes))).tolist()
+    error_bound = [s + c for s, c in zip(sampling_error, scaling_error)]
+
+    return {
+        'frames': [round(size / sample_rate) for size in scaled_sizes],
+        'miss_ratio': miss_ratio,
+        'error_bound': error_bound,
+        'sampling_error': sampling_error,
+        'scaling_error': scaling_error,
+        'sample_rate': sample_rate,
+        'sampled_references': sampled,
+        'total_references': total,
+        'algorithm': algorithm,
+    }